@@ -11,7 +11,9 @@ from backend.schemas.time_slots_schema import (
     TimeSlotsCreateResponse,
     TimeSlotsSelfCreateRequest,
     SelfTimeSlotsGetResponse,
+    SelfTimeSlotsRangeGetResponse,
     ExternalTimeSlotsGetResponse,
+    ExternalTimeSlotsRangeGetResponse,
     UpdateTimeSlotsRequest,
     TimeSlotsModelPydantic
 )
@@ -19,7 +21,8 @@ from backend.facade.time_slots_facade import TimeSlotsFacade
 from backend.exceptions import (
     UserDoesNotExistsError,
     ShareTokenDoesNotExistsError,
-    TimeSlotOverlapError
+    TimeSlotOverlapError,
+    InvalidDateRangeError
 )
 
 
@@ -86,6 +89,29 @@ async def get_self_time_slots(
         raise HTTPException(status_code=409, detail="User does not exists")
 
 
+@time_slots_router_external.get(
+    '/self/{start_date}/{end_date}',
+    response_model=SelfTimeSlotsRangeGetResponse
+)
+async def get_self_time_slots_range(
+        start_date: date,
+        end_date: date,
+        current_user_id: UUID = Depends(get_current_user),
+        time_slots_facade: TimeSlotsFacade = Depends(get_time_slots_facade)
+):
+    try:
+        time_slots = await time_slots_facade.get_self_time_slots_range(
+            user_id=current_user_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+        return time_slots
+    except InvalidDateRangeError:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    except UserDoesNotExistsError:
+        raise HTTPException(status_code=409, detail="User does not exists")
+
+
 @time_slots_router_external.get(
     '/{owner_token}/{target_date}',
     response_model=ExternalTimeSlotsGetResponse
@@ -109,21 +135,50 @@ async def get_external_time_slots(
         raise HTTPException(status_code=404, detail="Incorrect token")
 
 
+@time_slots_router_external.get(
+    '/{owner_token}/{start_date}/{end_date}',
+    response_model=ExternalTimeSlotsRangeGetResponse
+)
+async def get_external_time_slots_range(
+        owner_token: str,
+        start_date: date,
+        end_date: date,
+        current_user_id: UUID = Depends(get_current_user),
+        time_slots_facade: TimeSlotsFacade = Depends(get_time_slots_facade)
+):
+    try:
+        days = await time_slots_facade.get_external_time_slots_range(
+            user_id=current_user_id,
+            owner_token=owner_token,
+            start_date=start_date,
+            end_date=end_date
+        )
+        return ExternalTimeSlotsRangeGetResponse(days=days)
+    except InvalidDateRangeError:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    except UserDoesNotExistsError:
+        raise HTTPException(status_code=409, detail="User does not exists")
+    except ShareTokenDoesNotExistsError:
+        raise HTTPException(status_code=404, detail="Incorrect token")
+
+
 @time_slots_router_external.patch('/', response_model=TimeSlotsModelPydantic)
 async def update_time_slot(
         update_data: UpdateTimeSlotsRequest,
         current_user_id: UUID = Depends(get_current_user),
         time_slots_facade: TimeSlotsFacade = Depends(get_time_slots_facade)
 ):
-    time_slot = await time_slots_facade.update_time_slot(
-        time_slot_id=update_data.time_slot_id,
-        confirm=update_data.confirm,
-        title=update_data.title,
-        description=update_data.description,
-        meeting_url=update_data.meeting_url
-    )
-
-    return time_slot
+    try:
+        time_slot = await time_slots_facade.update_time_slot(
+            time_slot_id=update_data.time_slot_id,
+            confirm=update_data.confirm,
+            title=update_data.title,
+            description=update_data.description,
+            meeting_url=update_data.meeting_url
+        )
+        return time_slot
+    except TimeSlotOverlapError:
+        raise HTTPException(status_code=409, detail="Time slot overlap")
 
 
 @time_slots_router_external.delete('/self/{time_slot_id}')
@@ -13,6 +13,7 @@ from backend.schemas.token_schema import InputData, TokenResponse
 from backend.services.user_service import UserService
 from backend.facade.share_facade import ShareFacade
 from backend.settings.settings import settings
+from backend.exceptions import ShareTokenDoesNotExistsError
 
 import logging
 
@@ -72,5 +73,8 @@ async def get_name_by_token(
         token: str,
         share_facade: ShareFacade = Depends(get_share_facade)
 ):
-    user = await share_facade.get_user_by_token(token=token)
-    return UserNameResponse(name=user.name)
+    try:
+        user = await share_facade.get_user_by_token(token=token)
+        return UserNameResponse(name=user.name)
+    except ShareTokenDoesNotExistsError:
+        raise HTTPException(status_code=404, detail="Incorrect token")
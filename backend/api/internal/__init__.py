@@ -1,3 +1,6 @@
+from backend.api.internal.cache import cache_router_internal
+from backend.api.internal.db import db_router_internal
+from backend.api.internal.metrics import metrics_router_internal
 from backend.api.internal.reminder import reminder_router_internal
 from backend.api.internal.share import share_router_internal
 from backend.api.internal.time_slots import time_slots_router_internal
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+
+from backend.dependes import get_settings_service, get_share_service, get_busy_bitmap_service
+from backend.services.settings_service import SettingsService
+from backend.services.share_service import ShareService
+from backend.services.busy_bitmap_service import BusyBitmapService
+from backend.schemas.cache_schema import CacheStatsResponse
+
+
+cache_router_internal = APIRouter(prefix='/cache')
+cache_router_internal.tags = ["Cache"]
+
+
+@cache_router_internal.get('/', response_model=CacheStatsResponse)
+async def get_cache_stats(
+        settings_service: SettingsService = Depends(get_settings_service),
+        share_service: ShareService = Depends(get_share_service),
+        busy_bitmap_service: BusyBitmapService = Depends(get_busy_bitmap_service)
+):
+    return CacheStatsResponse(
+        settings=settings_service.get_cache_stats(),
+        share_tokens=share_service.get_cache_stats(),
+        busy_bitmaps=busy_bitmap_service.get_cache_stats()
+    )
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+
+from backend.database import get_pool_stats
+from backend.schemas.db_schema import PoolStats
+
+
+db_router_internal = APIRouter(prefix='/db')
+db_router_internal.tags = ["Database"]
+
+
+@db_router_internal.get('/pool', response_model=PoolStats)
+async def get_db_pool_stats():
+    return get_pool_stats()
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from backend.metrics import registry, CONTENT_TYPE
+
+
+metrics_router_internal = APIRouter()
+metrics_router_internal.tags = ["Metrics"]
+
+
+@metrics_router_internal.get('/metrics', response_class=Response)
+async def get_metrics():
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
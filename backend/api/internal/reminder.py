@@ -13,6 +13,8 @@ async def check_reminder(
         time_slots_facade: TimeSlotsFacade = Depends(get_time_slots_facade)
 ):
     await time_slots_facade.check_reminders()
+    # Тот же тик подбирает встречи, ссылка для которых не создалась (сбой или рестарт)
+    await time_slots_facade.provision_missing_meetings()
 
 
 @reminder_router_internal.post('/daily_reminder/')
@@ -10,6 +10,7 @@ from backend.schemas.time_slots_schema import (
     TimeSlotsCreateResponse,
     TimeSlotsSelfCreateRequest,
     SelfTimeSlotsGetResponse,
+    SelfTimeSlotsRangeGetResponse,
     ExternalTimeSlotsGetResponse,
     UpdateTimeSlotsRequest,
     TimeSlotsModelPydantic,
@@ -20,6 +21,7 @@ from backend.exceptions import (
     UserDoesNotExistsError,
     ShareTokenDoesNotExistsError,
     TimeSlotOverlapError,
+    InvalidDateRangeError,
     TextParserError
 )
 
@@ -44,20 +46,45 @@ async def get_self_time_slots(
         raise HTTPException(status_code=409, detail="User does not exists")
 
 
+@time_slots_router_internal.get(
+    '/self/{max_id}/{start_date}/{end_date}',
+    response_model=SelfTimeSlotsRangeGetResponse
+)
+async def get_self_time_slots_range(
+        max_id: int,
+        start_date: date,
+        end_date: date,
+        time_slots_facade: TimeSlotsFacade = Depends(get_time_slots_facade)
+):
+    try:
+        time_slots = await time_slots_facade.get_self_time_slots_range_internal(
+            max_id=max_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+        return time_slots
+    except InvalidDateRangeError:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    except UserDoesNotExistsError:
+        raise HTTPException(status_code=409, detail="User does not exists")
+
+
 @time_slots_router_internal.patch('/', response_model=TimeSlotsModelPydantic)
 async def update_time_slot(
         update_data: UpdateTimeSlotsRequest,
         time_slots_facade: TimeSlotsFacade = Depends(get_time_slots_facade)
 ):
-    time_slot = await time_slots_facade.update_time_slot(
-        time_slot_id=update_data.time_slot_id,
-        confirm=update_data.confirm,
-        title=update_data.title,
-        description=update_data.description,
-        meeting_url=update_data.meeting_url
-    )
-
-    return time_slot
+    try:
+        time_slot = await time_slots_facade.update_time_slot(
+            time_slot_id=update_data.time_slot_id,
+            confirm=update_data.confirm,
+            title=update_data.title,
+            description=update_data.description,
+            meeting_url=update_data.meeting_url
+        )
+        return time_slot
+    except TimeSlotOverlapError:
+        raise HTTPException(status_code=409, detail="Time slot overlap")
 
 
 @time_slots_router_internal.post('/self/by_text/', response_model=TimeSlotsCreateResponse)
@@ -8,6 +8,9 @@ from backend.api.external import (
 )
 
 from backend.api.internal import (
+    cache_router_internal,
+    db_router_internal,
+    metrics_router_internal,
     reminder_router_internal,
     share_router_internal,
     time_slots_router_internal,
@@ -22,6 +25,9 @@ api_router_external.include_router(time_slots_router_external)
 api_router_external.include_router(user_router_external)
 
 api_router_internal = APIRouter(prefix="/internal/api/v1")
+api_router_internal.include_router(cache_router_internal)
+api_router_internal.include_router(db_router_internal)
+api_router_internal.include_router(metrics_router_internal)
 api_router_internal.include_router(reminder_router_internal)
 api_router_internal.include_router(share_router_internal)
 api_router_internal.include_router(time_slots_router_internal)
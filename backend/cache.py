@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar, Hashable, Tuple, Any
+
+from backend.schemas.cache_schema import CacheStats
+
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+# Отличает отсутствие записи от закэшированного None
+MISSING: Any = object()
+
+
+class TTLCache(Generic[_K, _V]):
+    """
+    Ограниченный кэш процесса: записи живут не дольше ttl секунд,
+    при переполнении вытесняется давно не использованная запись.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._data: OrderedDict[_K, Tuple[float, _V]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: _K, default: Any = MISSING) -> _V:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: _K, value: _V, ttl: float = None) -> None:
+        expires_at = time.monotonic() + (self._ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: _K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._data),
+            max_size=self._max_size,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions
+        )
@@ -5,6 +5,7 @@ from typing import Dict, Any, Optional
 
 from gigachat import GigaChatAsyncClient
 
+from backend.metrics import track_call
 from backend.settings.settings import Settings
 
 
@@ -89,7 +90,8 @@ class GigachatClient:
 
         for attempt in range(1, self.max_retries + 1):
             try:
-                response = await self.giga.achat(prompt)
+                with track_call(service="gigachat", operation="chat"):
+                    response = await self.giga.achat(prompt)
                 content = response.choices[0].message.content.strip()
 
                 # Попытка распарсить JSON
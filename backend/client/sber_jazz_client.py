@@ -1,18 +1,26 @@
+import asyncio
 import base64
 import datetime
 import json
 import uuid
 from uuid import UUID
+from typing import Dict, Optional
 
 import jwt
 from jwt import PyJWK
 import aiohttp
 
+from backend.cache import TTLCache, MISSING
+from backend.metrics import track_call
 from backend.settings.settings import Settings
 
 
 class SberJazzClient:
     BASE_URL = "https://api.salutejazz.ru/v1"
+    # Транспортный токен живёт час, обновляем его заранее
+    TOKEN_TTL = datetime.timedelta(hours=1)
+    TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+    TOKEN_CACHE_MAX_SIZE = 10000
 
     def __init__(self, settings: Settings):
         sdk_key_encoded = settings.sber_api_key
@@ -23,9 +31,31 @@ class SberJazzClient:
         self.kid = sdk_key['key']['kid']
         self.timeout = aiohttp.ClientTimeout(total=30)
 
+        # Сессия создаётся лениво: ей нужен запущенный event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._tokens: TTLCache[UUID, str] = TTLCache(
+            max_size=self.TOKEN_CACHE_MAX_SIZE,
+            ttl=(self.TOKEN_TTL - self.TOKEN_REFRESH_MARGIN).total_seconds()
+        )
+        # Незавершённые логины: параллельные запросы одного пользователя ждут общий
+        self._token_refreshes: Dict[UUID, asyncio.Future] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     def _generate_jwt(self, user_id: UUID) -> str:
         iat = datetime.datetime.now(datetime.UTC)
-        exp = iat + datetime.timedelta(hours=1)
+        exp = iat + self.TOKEN_TTL
         jti = str(uuid.uuid4())
 
         payload = {
@@ -51,6 +81,23 @@ class SberJazzClient:
         return token
 
     async def _get_transport_token(self, user_id: UUID) -> str:
+        token = self._tokens.get(user_id)
+        if token is not MISSING:
+            return token
+
+        refresh = self._token_refreshes.get(user_id)
+        if refresh is None:
+            refresh = asyncio.ensure_future(self._login(user_id))
+            self._token_refreshes[user_id] = refresh
+            refresh.add_done_callback(lambda _: self._token_refreshes.pop(user_id, None))
+
+        # Отмена одного ожидающего не должна прерывать общий логин
+        return await asyncio.shield(refresh)
+
+    def _drop_transport_token(self, user_id: UUID) -> None:
+        self._tokens.invalidate(user_id)
+
+    async def _login(self, user_id: UUID) -> str:
         jws = self._generate_jwt(user_id)
 
         headers = {
@@ -58,13 +105,16 @@ class SberJazzClient:
             "Authorization": f"Bearer {jws}"
         }
 
-        async with aiohttp.ClientSession(timeout=self.timeout) as session:
-            async with session.post(f"{self.BASE_URL}/auth/login", headers=headers) as resp:
+        with track_call(service="sber_jazz", operation="auth_login"):
+            async with self._get_session().post(f"{self.BASE_URL}/auth/login", headers=headers) as resp:
                 if resp.status != 200:
                     text = await resp.text()
                     raise RuntimeError(f"Ошибка при получении токена: {resp.status} {text}")
                 data = await resp.json()
-                return data["token"]
+
+        token = data["token"]
+        self._tokens.set(user_id, token)
+        return token
 
     async def create_meeting(
             self,
@@ -93,9 +143,11 @@ class SberJazzClient:
             "summarizationEnabled": summary
         }
 
-        async with aiohttp.ClientSession(timeout=self.timeout) as session:
-            async with session.post(f"{self.BASE_URL}/room/create", headers=headers, json=body) as resp:
+        with track_call(service="sber_jazz", operation="room_create"):
+            async with self._get_session().post(f"{self.BASE_URL}/room/create", headers=headers, json=body) as resp:
                 if resp.status != 200:
+                    if resp.status == 401:
+                        self._drop_transport_token(user_id)
                     text = await resp.text()
                     raise RuntimeError(f"Ошибка при создании комнаты: {resp.status} {text}")
                 data = await resp.json()
@@ -108,9 +160,11 @@ class SberJazzClient:
             "Accept": "application/json"
         }
 
-        async with aiohttp.ClientSession(timeout=self.timeout) as session:
-            async with session.get(f"{self.BASE_URL}/room/{room_id}/summarizations", headers=headers) as resp:
+        with track_call(service="sber_jazz", operation="room_summarizations"):
+            async with self._get_session().get(f"{self.BASE_URL}/room/{room_id}/summarizations", headers=headers) as resp:
                 if resp.status != 200:
+                    if resp.status == 401:
+                        self._drop_transport_token(user_id)
                     text = await resp.text()
                     raise RuntimeError(f"Ошибка при получении саммари: {resp.status} {text}")
                 return await resp.json()
@@ -1,31 +1,143 @@
+import logging
+import time
+import uuid
 from contextvars import ContextVar
-from typing import AsyncGenerator, Optional, Dict
+from typing import AsyncGenerator, Optional, Dict, Any
 
 from fastapi_sqlalchemy.exceptions import MissingSessionError
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.types import ASGIApp
-
+from sqlalchemy.orm import DeclarativeBase, Session, ORMExecuteState
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from backend.enums.db_pool_mode_enum import DBPoolMode
+from backend.enums.profile_enum import Profile
+from backend.metrics import instrument_engine
+from backend.schemas.db_schema import PoolStats
 from backend.settings.settings import settings
 
 
 DATABASE_URL = settings.sql_alchemy_connection_url
 
+
+class _PoolWaitStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def record(self, wait_seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+
+_pool_wait_stats = _PoolWaitStats()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """ Пул, замеряющий ожидание свободного соединения при checkout. """
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            _pool_wait_stats.timeouts += 1
+            raise
+        finally:
+            _pool_wait_stats.record(time.perf_counter() - started_at)
+
+
+def _engine_options() -> Dict[str, Any]:
+    if settings.db_pool_mode == DBPoolMode.NULL:
+        # pgbouncer в режиме transaction отдаёт разные серверные соединения,
+        # поэтому prepared statements не кэшируются и получают уникальные имена
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__"
+            }
+        }
+
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {
+            "statement_cache_size": settings.db_statement_cache_size
+        }
+    }
+
+
 # Создаем движок один раз
 async_engine = create_async_engine(
     DATABASE_URL,
     echo=settings.sql_echo,
-    pool_size=50,
-    max_overflow=10,
-    pool_pre_ping=True
+    **_engine_options()
 )
+instrument_engine(async_engine.sync_engine)
+
+
+def get_pool_stats() -> PoolStats:
+    pool = async_engine.pool
+    stats = PoolStats(
+        mode=settings.db_pool_mode.value,
+        checkouts=_pool_wait_stats.checkouts,
+        wait_seconds_total=_pool_wait_stats.wait_seconds_total,
+        wait_seconds_max=_pool_wait_stats.wait_seconds_max,
+        timeouts=_pool_wait_stats.timeouts
+    )
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        capacity = settings.db_pool_size + settings.db_max_overflow
+        stats.size = pool.size()
+        stats.max_overflow = settings.db_max_overflow
+        stats.checked_out = pool.checkedout()
+        # overflow() отрицателен, пока пул не заполнен до pool_size
+        stats.overflow = max(pool.overflow(), 0)
+        stats.saturation = pool.checkedout() / capacity if capacity else None
+
+    return stats
+
+# Ключ в session.info: в текущей транзакции были изменения, которые ещё не закоммичены
+_WRITES_KEY = "db:has_writes"
+
+
+class TrackedSession(Session):
+    """ Sync-часть AsyncSession, которая отмечает в info незакоммиченные изменения. """
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _mark_flush(session: Session, flush_context) -> None:
+    session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _mark_dml(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(TrackedSession, "after_commit")
+@event.listens_for(TrackedSession, "after_rollback")
+def _reset_writes(session: Session) -> None:
+    session.info.pop(_WRITES_KEY, None)
+
 
 # Создаем фабрику сессий один раз
 async_session_factory = async_sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
+    sync_session_class=TrackedSession,
     expire_on_commit=False
 )
 
@@ -46,79 +158,172 @@ class Base(DeclarativeBase):
     pass
 
 
-class Boolean:
-    def __init__(self, value: bool):
-        self.value: bool = value
-
+class _SessionHolder:
+    """
+    Сессия текущего запроса или фоновой задачи. AsyncSession, а вместе с ней и
+    соединение из пула, создаётся только при первом обращении к db.session.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self.session: Optional[AsyncSession] = None
+        # Состояние уровня запроса (например, RequestLoader), не требующее соединения
+        self.info: Dict = {}
+        self.close_after_exit = True
+        # Заполняются только при db_query_stats_enabled
+        self.query_count = 0
+        self.query_seconds = 0.0
+
+    def get_session(self) -> AsyncSession:
+        if self.session is None:
+            self.session = async_session_factory()
+        return self.session
+
+    def has_writes(self) -> bool:
+        return self.session is not None and bool(self.session.info.get(_WRITES_KEY))
+
+    async def commit_if_written(self) -> None:
+        if self.has_writes():
+            await self.session.commit()
+
+    async def close(self, commit: bool) -> None:
+        if self.session is None:
+            return
 
-_session: ContextVar[Optional[AsyncSession]] = ContextVar("_session", default=None)
-close_session_after_exit: ContextVar[Optional[Boolean]] = ContextVar("close_session_after_exit", default=None)
+        try:
+            if not commit:
+                await self.session.rollback()
+            else:
+                await self.commit_if_written()
+        finally:
+            # close() откатывает незавершённую читающую транзакцию и возвращает соединение
+            await self.session.close()
+            self.session = None
+
+
+_session: ContextVar[Optional[_SessionHolder]] = ContextVar("_session", default=None)
+
+
+def _bind_shape(parameters: Any, executemany: bool) -> str:
+    """ Типы параметров без значений, чтобы в лог не попадали данные пользователей. """
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} x {_bind_shape(rows[0], False)}" if rows else "0 rows"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+if settings.db_query_stats_enabled:
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context.query_started_at = time.perf_counter()
+
+    @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context.query_started_at
+
+        holder = _session.get()
+        if holder is not None:
+            holder.query_count += 1
+            holder.query_seconds += elapsed
+
+        if elapsed * 1000 >= settings.db_slow_query_ms:
+            logging.warning(
+                "Медленный запрос %.1f мс (%s): %s; параметры: %s",
+                elapsed * 1000,
+                holder.name if holder is not None else "-",
+                statement,
+                _bind_shape(parameters, executemany)
+            )
+
+
+class AsyncDBSessionMiddleware:
+    """
+    Чистый ASGI middleware: без задач и потоков BaseHTTPMiddleware, а запросы,
+    не обращавшиеся к db.session (preflight, health), не берут соединение.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        async with db(name=f"{scope['method']} {scope['path']}"):
+            holder = _session.get()
 
-class AsyncDBSessionMiddleware(BaseHTTPMiddleware):
-    def __init__(
-        self,
-        app: ASGIApp,
-        session_args: Dict = None,
-        commit_on_exit: bool = False,
-    ):
-        super().__init__(app)
+            async def send_wrapper(message: Message) -> None:
+                # Изменения фиксируются до того, как клиент увидит ответ
+                if message["type"] == "http.response.start":
+                    await holder.commit_if_written()
+                    if settings.db_query_stats_enabled and settings.profile != Profile.PROD:
+                        headers = MutableHeaders(scope=message)
+                        headers.append("X-DB-Queries", str(holder.query_count))
+                        headers.append("X-DB-Time", f"{holder.query_seconds * 1000:.1f}")
+                await send(message)
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
-        async with db():
-            response = await call_next(request)
-        return response
+            await self.app(scope, receive, send_wrapper)
 
 
 class DBSessionMeta(type):
     @property
     def session(self) -> AsyncSession:
         """Return an instance of Session local to the current async context."""
-        session = _session.get()
-        if session is None:
+        holder = _session.get()
+        if holder is None:
             raise MissingSessionError
-        return session
+        return holder.get_session()
+
+    @property
+    def info(self) -> Dict:
+        """ Состояние текущего контекста, доступное без открытия сессии. """
+        holder = _session.get()
+        if holder is None:
+            raise MissingSessionError
+        return holder.info
 
     def set_close_session_after_exit(self, value: bool):
-        close_session_after_exit.get().value = value
+        _session.get().close_after_exit = value
 
 
 class DBSession(metaclass=DBSessionMeta):
-    def __init__(self):
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
         self.token = None
-        self.token_close_session_after_exit = None
 
     async def __aenter__(self):
-        async with async_session_factory() as session:
-            self.token = _session.set(session)
-            boolean = Boolean(True)
-            self.token_close_session_after_exit = close_session_after_exit.set(boolean)
+        self.token = _session.set(_SessionHolder(name=self.name))
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        if close_session_after_exit.get().value is False:
+        holder = _session.get()
+        if holder.close_after_exit is False:
             return
 
-        sess = _session.get()
         try:
-            if exc_type is not None:
-                await sess.rollback()
-            else:
-                await sess.commit()
+            await holder.close(commit=exc_type is None)
         finally:
-            await sess.close()
             _session.reset(self.token)
 
+        if settings.db_query_stats_enabled and holder.query_count:
+            logging.info(
+                "%s: %d SQL-запросов, %.1f мс в БД",
+                holder.name or "db",
+                holder.query_count,
+                holder.query_seconds * 1000
+            )
+
 
 async def commit_and_close_session():
-    sess = _session.get()
-    await sess.commit()
-    await sess.close()
+    await _session.get().close(commit=True)
 
 
 async def rollback_and_close_session():
-    sess = _session.get()
-    await sess.rollback()
-    await sess.close()
+    await _session.get().close(commit=False)
 
 
 db: DBSessionMeta = DBSession
@@ -1,21 +1,16 @@
 import functools
-from contextvars import Token
 
-from backend.database import async_session_factory, _session
+from backend.database import db
 
 
 def background_session(func):
     """
-    Для фоновых тасок: игнорируем текущий db.session,
-    создаём свою AsyncSession и вкидываем её в ContextVar.
+    Для фоновых тасок: игнорируем текущий db.session и открываем
+    свой контекст. Сессия создаётся лениво при первом обращении.
     """
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
-        # создаём новую сессию независимо от контекста
-        async with async_session_factory() as new_sess:
-            token: Token = _session.set(new_sess)
-            try:
-                return await func(*args, **kwargs)
-            finally:
-                _session.reset(token)
+        # новый контекст независимо от запроса, породившего задачу
+        async with db(name=func.__qualname__):
+            return await func(*args, **kwargs)
     return wrapper
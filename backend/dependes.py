@@ -7,10 +7,12 @@ from backend.repository.share_repository import ShareRepository
 from backend.repository.time_slot_alert_repository import TimeSlotAlertRepository
 from backend.repository.daily_alert_repository import DailyAlertRepository
 from backend.repository.onboarding_repository import OnboardingRepository
+from backend.repository.reminder_watermark_repository import ReminderWatermarkRepository
 
 from backend.services.user_service import UserService
 from backend.services.settings_service import SettingsService
 from backend.services.time_slots_service import TimeSlotsService
+from backend.services.busy_bitmap_service import BusyBitmapService
 from backend.services.share_service import ShareService
 from backend.services.notification_service import NotificationService
 from backend.services.time_slot_alert_service import TimeSlotAlertService
@@ -101,6 +103,13 @@ def get_onboarding_repository() -> OnboardingRepository:
     return _onboarding_repository
 
 
+_reminder_watermark_repository = ReminderWatermarkRepository()
+
+
+def get_reminder_watermark_repository() -> ReminderWatermarkRepository:
+    return _reminder_watermark_repository
+
+
 #######################
 #       Services      #
 #######################
@@ -132,8 +141,19 @@ def get_time_slots_service() -> TimeSlotsService:
     return _time_slots_service
 
 
+_busy_bitmap_service = BusyBitmapService(
+    time_slots_repository=get_time_slots_repository()
+)
+
+
+def get_busy_bitmap_service() -> BusyBitmapService:
+    return _busy_bitmap_service
+
+
 _share_service = ShareService(
-    share_repository=get_share_repository()
+    share_repository=get_share_repository(),
+    user_service=get_user_service(),
+    settings_service=get_settings_service()
 )
 
 
@@ -151,7 +171,8 @@ def get_notification_service() -> NotificationService:
 
 
 _time_slot_alert_service = TimeSlotAlertService(
-    time_slot_alert_repository=get_time_slot_alert_repository()
+    time_slot_alert_repository=get_time_slot_alert_repository(),
+    reminder_watermark_repository=get_reminder_watermark_repository()
 )
 
 
@@ -204,6 +225,7 @@ def get_share_facade() -> ShareFacade:
 
 _time_slots_facade = TimeSlotsFacade(
     time_slots_service=get_time_slots_service(),
+    busy_bitmap_service=get_busy_bitmap_service(),
     user_service=get_user_service(),
     share_service=get_share_service(),
     settings_service=get_settings_service(),
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class DBPoolMode(Enum):
+    QUEUE = "queue"  # собственный пул соединений в каждом процессе
+    NULL = "null"  # без пула, соединения держит pgbouncer в режиме transaction
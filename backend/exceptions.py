@@ -18,5 +18,9 @@ class TimeSlotOverlapError(Exception):
     """ Slot does not exists """
 
 
+class InvalidDateRangeError(Exception):
+    """ Invalid date range """
+
+
 class TextParserError(Exception):
     """ Text parser error """
@@ -1,6 +1,6 @@
 from backend.services.share_service import ShareService
 from backend.services.user_service import UserService
-from backend.exceptions import UserDoesNotExistsError
+from backend.exceptions import UserDoesNotExistsError, ShareTokenDoesNotExistsError
 from backend.schemas.user_schema import UserModelPydantic
 
 
@@ -18,6 +18,8 @@ class ShareFacade:
         return token
 
     async def get_user_by_token(self, token: str) -> UserModelPydantic:
-        share_data = await self._share_service.get_share_data_by_token(token=token)
-        user = await self._user_service.get_by_user_id(user_id=share_data.owner_id)
-        return user
+        shared_owner = await self._share_service.resolve_owner(token=token)
+        if shared_owner is None:
+            raise ShareTokenDoesNotExistsError
+
+        return shared_owner.owner
@@ -1,12 +1,13 @@
-from typing import Optional, List
+import asyncio
+import logging
+from typing import Optional, List, Tuple, Dict
 from datetime import datetime, date, timedelta, timezone
 from uuid import UUID
-import math
-from copy import deepcopy
 import re
 
 from backend.services.user_service import UserService
 from backend.services.time_slots_service import TimeSlotsService
+from backend.services.busy_bitmap_service import BusyBitmapService
 from backend.services.share_service import ShareService
 from backend.services.settings_service import SettingsService
 from backend.services.time_slot_alert_service import TimeSlotAlertService
@@ -16,6 +17,7 @@ from backend.exceptions import (
     ShareTokenDoesNotExistsError,
     TimeSlotDoesNotExistsError,
     TimeSlotOverlapError,
+    InvalidDateRangeError,
     TextParserError
 )
 from backend.schemas.notification_schema import (
@@ -25,28 +27,48 @@ from backend.schemas.notification_schema import (
     SelfBookingNotification,
     DailyReminderNotification
 )
+from backend.schemas.time_slot_alert_schema import DueTimeSlotAlert
 from backend.schemas.time_slots_schema import (
     SelfTimeSlotsGetResponse,
+    SelfTimeSlotsRangeGetResponse,
+    SelfDayTimeSlots,
     GetSelfTimeSlot,
     TimeSlotsModelPydantic,
-    GetExternalTimeSlot
+    GetExternalTimeSlot,
+    ExternalDayTimeSlots
 )
 from backend.client.sber_jazz_client import SberJazzClient
 from backend.client.gigachat_client import GigachatClient
+from backend.database import db
+from backend.intervals import (
+    MINUTES_PER_DAY,
+    minutes_since,
+    float_time_to_minutes,
+    minutes_to_float_time,
+    daily_slot_grid,
+    free_grid_slots_mask
+)
+from backend.settings.settings import settings
 from backend.signals import (
     new_slot_signal,
     alert_before_meet_signal,
     confirm_time_slot_signal,
+    meeting_link_signal,
     self_booking_signal,
     daily_reminder_signal
 )
 
 
+# Имя пользователя в MAX может быть не заполнено
+UNKNOWN_USER_NAME = "без имени"
+
+
 class TimeSlotsFacade:
     def __init__(
             self,
             user_service: UserService,
             time_slots_service: TimeSlotsService,
+            busy_bitmap_service: BusyBitmapService,
             share_service: ShareService,
             settings_service: SettingsService,
             sber_jazz_client: SberJazzClient,
@@ -56,12 +78,16 @@ class TimeSlotsFacade:
     ):
         self._user_service = user_service
         self._time_slots_service = time_slots_service
+        self._busy_bitmap_service = busy_bitmap_service
         self._share_service = share_service
         self._settings_service = settings_service
         self._sber_jazz_client = sber_jazz_client
         self._time_slot_alert_service = time_slot_alert_service
         self._gigachat_client = gigachat_client
         self._daily_alert_service = daily_alert_service
+        # Задачи создания встреч по слотам: сильные ссылки, иначе их может
+        # собрать GC до завершения, и защита от повторного запуска
+        self._provision_tasks: Dict[UUID, asyncio.Task] = {}
 
     def to_utc_naive(self, dt: datetime, tz_offset_hours: int) -> datetime:
         if dt.tzinfo is None:
@@ -83,18 +109,19 @@ class TimeSlotsFacade:
             title: Optional[str] = None,
             description: Optional[str] = None
     ) -> UUID:
+        shared_owner = await self._share_service.resolve_owner(token=owner_token)
+
+        if shared_owner is None:
+            raise ShareTokenDoesNotExistsError
+
+        owner_user = shared_owner.owner
+        owner_settings = shared_owner.owner_settings
+
         invited_user = await self._user_service.get_by_user_id(user_id=invited_user_id)
-        invited_settings = await self._settings_service.get_settings(user_id=invited_user.id)
         if invited_user is None:
             raise UserDoesNotExistsError
 
-        share_data = await self._share_service.get_share_data_by_token(token=owner_token)
-
-        if share_data is None:
-            raise ShareTokenDoesNotExistsError
-
-        owner_user = await self._user_service.get_by_user_id(user_id=share_data.owner_id)
-        owner_settings = await self._settings_service.get_settings(user_id=owner_user.id)
+        invited_settings = await self._settings_service.get_settings(user_id=invited_user.id)
 
         utc_meet_start_at = self.to_utc_naive(dt=meet_start_at, tz_offset_hours=invited_settings.timezone)
         utc_meet_end_at = self.to_utc_naive(dt=meet_end_at, tz_offset_hours=invited_settings.timezone)
@@ -140,24 +167,27 @@ class TimeSlotsFacade:
         utc_meet_start_at = self.to_utc_naive(dt=meet_start_at, tz_offset_hours=owner_settings.timezone)
         aware_meet_end_at = self.to_utc_naive(dt=meet_end_at, tz_offset_hours=owner_settings.timezone)
 
-        overlap_slots = await self._time_slots_service.get_user_overlapping_slot(
-            user_id=user.id,
-            meet_start_at_target=utc_meet_start_at,
-            meet_end_at_target=aware_meet_end_at
-        )
-
-        if overlap_slots != []:
-            raise TimeSlotOverlapError
-
-        time_slot = await self._time_slots_service.create_time_slot(
-            owner_id=user.id,
-            invited_id=user.id,
-            meet_start_at=utc_meet_start_at,
-            meet_end_at=aware_meet_end_at,
-            confirm=True,
-            title=title,
-            description=description
-        )
+        try:
+            # Пересечения проверяет ограничение исключения в БД: маска занятости
+            # живёт в памяти процесса и может отставать от других воркеров
+            time_slot = await self._time_slots_service.create_time_slot(
+                owner_id=user.id,
+                invited_id=user.id,
+                meet_start_at=utc_meet_start_at,
+                meet_end_at=aware_meet_end_at,
+                confirm=True,
+                title=title,
+                description=description
+            )
+        except TimeSlotOverlapError:
+            # Маска не знала о пересекающемся слоте, перечитаем её из БД
+            self._busy_bitmap_service.invalidate_range(
+                user_ids=[user.id],
+                start_at=utc_meet_start_at,
+                end_at=aware_meet_end_at
+            )
+            raise
+        self._busy_bitmap_service.mark_busy(time_slot)
 
         await self_booking_signal.send_async(
             SelfBookingNotification(
@@ -175,201 +205,165 @@ class TimeSlotsFacade:
         weekday_index = target_date.weekday()
         return bool(working_days_bitmask & (1 << weekday_index))
 
-    def is_overlap(self, start1: float, end1: float, start2: float, end2: float) -> bool:
-        return not (end1 <= start2 or start1 >= end2)
-
-    def float_time_to_minutes(self, t: float) -> int:
-        hours = int(math.floor(t))
-        minutes = int(round((t - hours) * 100))
-        if minutes < 0 or minutes >= 60:
-            raise ValueError(f"Некорректное значение минут: {minutes} (вход: {t})")
-        return hours * 60 + minutes
-
-    def minutes_to_float_time(self, m: int) -> float:
-        hours = m // 60
-        minutes = m % 60
-        return float(f"{hours}.{minutes:02d}")
-
-    def datetime_to_float(self, dt: datetime) -> float:
-        return float(f"{dt.hour}.{dt.minute:02d}")
-
     def get_available_external_slots(
             self,
-            all_slots: List[GetSelfTimeSlot],
-            owner_booked_slots: List[TimeSlotsModelPydantic],
-            invited_booked_slots: List[TimeSlotsModelPydantic]
-    ) -> List[GetExternalTimeSlot]:
-        owner_confirmed = [s for s in owner_booked_slots if s.confirm]
-        invited_confirmed = [s for s in invited_booked_slots if s.confirm]
-
-        booked_intervals = []
-        for s in owner_confirmed + invited_confirmed:
-            booked_intervals.append((
-                self.datetime_to_float(s.meet_start_at),
-                self.datetime_to_float(s.meet_end_at)
-            ))
-
-        free_slots: List[GetExternalTimeSlot] = []
-
-        for slot in all_slots:
-            overlaps = any(
-                self.is_overlap(slot.meet_start_at, slot.meet_end_at, start, end)
-                for start, end in booked_intervals
-            )
-            if not overlaps:
-                free_slots.append(
-                    GetExternalTimeSlot(
-                        meet_start_at=slot.meet_start_at,
-                        meet_end_at=slot.meet_end_at
-                    )
-                )
-
-        return free_slots
-
-    def merge_slots_with_bookings(
-            self,
-            all_slots: List[GetSelfTimeSlot],
-            booked_slots: List[TimeSlotsModelPydantic]
-    ) -> List[GetSelfTimeSlot]:
-        result_slots = deepcopy(all_slots)
-
-        confirmed_bookings = [
-            b for b in booked_slots if b.confirm
-        ]
-
-        confirmed_lookup = {
-            (self.datetime_to_float(b.meet_start_at), self.datetime_to_float(b.meet_end_at)): b
-            for b in confirmed_bookings
-        }
-
-        for slot in result_slots:
-            key = (slot.meet_start_at, slot.meet_end_at)
-            if key in confirmed_lookup:
-                booked = confirmed_lookup[key]
-                slot.title = booked.title
-                slot.description = booked.description
-
-        return result_slots
+            grid: Tuple[int, ...],
+            duration_minutes: int,
+            day_offset: int,
+            busy_mask: int
+    ) -> List[int]:
+        # busy_mask отсчитывается от начала всего периода, сдвигаем его к нужным суткам
+        return free_grid_slots_mask(
+            grid=grid,
+            duration_minutes=duration_minutes,
+            busy_mask=busy_mask >> day_offset
+        )
 
     def generate_daily_time_slots(
             self,
             work_time_start: float,
             work_time_end: float,
             duration_minutes: int
-    ) -> List[GetSelfTimeSlot]:
-        start_min = self.float_time_to_minutes(work_time_start)
-        end_min = self.float_time_to_minutes(work_time_end)
+    ) -> Tuple[int, ...]:
+        return daily_slot_grid(
+            start_min=float_time_to_minutes(work_time_start),
+            end_min=float_time_to_minutes(work_time_end),
+            duration_minutes=duration_minutes
+        )
 
-        if end_min <= start_min:
-            raise ValueError("work_time_end должен быть больше work_time_start")
+    def group_self_time_slots_by_day(
+            self,
+            booked_slots: List[TimeSlotsModelPydantic],
+            start_date: date,
+            end_date: date,
+            tz_offset_hours: int
+    ) -> List[SelfDayTimeSlots]:
+        range_start_at, _ = self._time_slots_service.local_day_bounds(
+            target_date=start_date,
+            tz_offset_hours=tz_offset_hours
+        )
 
-        slots: List[GetSelfTimeSlot] = []
-        current = start_min
+        days = [
+            SelfDayTimeSlots(date=start_date + timedelta(days=day_index), time_slots=[])
+            for day_index in range((end_date - start_date).days + 1)
+        ]
+
+        for slot in booked_slots:
+            # Минуты от локальной полуночи start_date; формат 14.30 только на выходе в API
+            start_min = minutes_since(slot.meet_start_at, range_start_at)
+            end_min = minutes_since(slot.meet_end_at, range_start_at)
+
+            # Слот относится к локальным суткам, в которые он начинается
+            day_index = start_min // MINUTES_PER_DAY
+            if not 0 <= day_index < len(days):
+                continue
 
-        while current + duration_minutes <= end_min:
-            slot_start = current
-            slot_end = current + duration_minutes
-            slots.append(
+            days[day_index].time_slots.append(
                 GetSelfTimeSlot(
-                    meet_start_at=self.minutes_to_float_time(slot_start),
-                    meet_end_at=self.minutes_to_float_time(slot_end)
+                    meet_start_at=minutes_to_float_time(start_min % MINUTES_PER_DAY),
+                    meet_end_at=minutes_to_float_time(end_min % MINUTES_PER_DAY),
+                    title=slot.title,
+                    description=slot.description,
+                    slot_id=slot.id,
+                    meeting_url=slot.meeting_url
                 )
             )
-            current += duration_minutes
 
-        return slots
+        return days
 
     async def get_self_time_slot(
             self,
             user_id: UUID,
             target_date: date
     ) -> SelfTimeSlotsGetResponse:
-        result_slots = []
+        result = await self.get_self_time_slots_range(
+            user_id=user_id,
+            start_date=target_date,
+            end_date=target_date
+        )
 
-        user = await self._user_service.get_by_user_id(user_id=user_id)
-        if user is None:
-            raise UserDoesNotExistsError
+        return SelfTimeSlotsGetResponse(time_slots=result.days[0].time_slots)
 
-        user_settings = await self._settings_service.get_settings(user_id=user.id)
-
-        booked_slots = await self._time_slots_service.get_time_self_slots(
-            user_id=user.id,
-            target_date=target_date
+    async def get_self_time_slot_internal(
+            self,
+            max_id: int,
+            target_date: date
+    ) -> SelfTimeSlotsGetResponse:
+        result = await self.get_self_time_slots_range_internal(
+            max_id=max_id,
+            start_date=target_date,
+            end_date=target_date
         )
 
-        unique_slots = {slot.id: slot for slot in booked_slots}.values()
-        unique_slots = list(unique_slots)
-
-        for slot in unique_slots:
-            meet_start_at = self.from_utc_naive(
-                dt_utc=slot.meet_start_at,
-                tz_offset_hours=user_settings.timezone
-            )
+        return SelfTimeSlotsGetResponse(time_slots=result.days[0].time_slots)
 
-            meet_end_at = self.from_utc_naive(
-                dt_utc=slot.meet_end_at,
-                tz_offset_hours=user_settings.timezone
-            )
+    async def get_self_time_slots_range(
+            self,
+            user_id: UUID,
+            start_date: date,
+            end_date: date
+    ) -> SelfTimeSlotsRangeGetResponse:
+        self.validate_date_range(start_date=start_date, end_date=end_date)
 
-            result_slots.append(
-                GetSelfTimeSlot(
-                    meet_start_at=self.datetime_to_float(meet_start_at),
-                    meet_end_at=self.datetime_to_float(meet_end_at),
-                    title=slot.title,
-                    description=slot.description,
-                    slot_id=slot.id,
-                    meeting_url=slot.meeting_url
-                )
-            )
+        user = await self._user_service.get_by_user_id(user_id=user_id)
+        if user is None:
+            raise UserDoesNotExistsError
 
-        return SelfTimeSlotsGetResponse(time_slots=result_slots)
+        return await self._get_user_self_time_slots_range(
+            user_id=user.id,
+            start_date=start_date,
+            end_date=end_date
+        )
 
-    async def get_self_time_slot_internal(
+    async def get_self_time_slots_range_internal(
             self,
             max_id: int,
-            target_date: date
-    ) -> SelfTimeSlotsGetResponse:
-        result_slots = []
+            start_date: date,
+            end_date: date
+    ) -> SelfTimeSlotsRangeGetResponse:
+        self.validate_date_range(start_date=start_date, end_date=end_date)
 
         user = await self._user_service.find_by_max_id(max_id=max_id)
         if user is None:
             raise UserDoesNotExistsError
 
-        user_settings = await self._settings_service.get_settings(user_id=user.id)
-
-        booked_slots = await self._time_slots_service.get_time_self_slots(
+        return await self._get_user_self_time_slots_range(
             user_id=user.id,
-            target_date=target_date
+            start_date=start_date,
+            end_date=end_date
         )
 
-        unique_slots = {slot.id: slot for slot in booked_slots}.values()
-        unique_slots = list(unique_slots)
-
-        for slot in unique_slots:
-            meet_start_at = self.from_utc_naive(
-                dt_utc=slot.meet_start_at,
-                tz_offset_hours=user_settings.timezone
-            )
+    async def _get_user_self_time_slots_range(
+            self,
+            user_id: UUID,
+            start_date: date,
+            end_date: date
+    ) -> SelfTimeSlotsRangeGetResponse:
+        user_settings = await self._settings_service.get_settings(user_id=user_id)
+
+        # Один запрос по обеим ролям за все локальные сутки периода
+        booked_slots = await self._time_slots_service.get_users_slots_in_range(
+            user_ids=[user_id],
+            start_date=start_date,
+            end_date=end_date,
+            tz_offset_hours=user_settings.timezone
+        )
 
-            meet_end_at = self.from_utc_naive(
-                dt_utc=slot.meet_end_at,
-                tz_offset_hours=user_settings.timezone
-            )
+        days = self.group_self_time_slots_by_day(
+            booked_slots=booked_slots,
+            start_date=start_date,
+            end_date=end_date,
+            tz_offset_hours=user_settings.timezone
+        )
 
-            result_slots.append(
-                GetSelfTimeSlot(
-                    meet_start_at=self.datetime_to_float(meet_start_at),
-                    meet_end_at=self.datetime_to_float(meet_end_at),
-                    title=slot.title,
-                    description=slot.description,
-                    slot_id=slot.id,
-                    meeting_url=slot.meeting_url
-                )
-            )
+        return SelfTimeSlotsRangeGetResponse(days=days)
 
-        sorted_slots = sorted(result_slots, key=lambda slot: slot.meet_start_at)
+    def validate_date_range(self, start_date: date, end_date: date) -> None:
+        if end_date < start_date:
+            raise InvalidDateRangeError
 
-        return SelfTimeSlotsGetResponse(time_slots=sorted_slots)
+        if (end_date - start_date).days + 1 > settings.time_slots_max_range_days:
+            raise InvalidDateRangeError
 
     async def get_external_time_slots(
             self,
@@ -377,19 +371,31 @@ class TimeSlotsFacade:
             owner_token: str,
             target_date: date
     ) -> List[GetExternalTimeSlot]:
-        share_data = await self._share_service.get_share_data_by_token(token=owner_token)
+        days = await self.get_external_time_slots_range(
+            user_id=user_id,
+            owner_token=owner_token,
+            start_date=target_date,
+            end_date=target_date
+        )
 
-        if share_data is None:
-            raise ShareTokenDoesNotExistsError
+        return days[0].time_slots
 
-        owner_user = await self._user_service.get_by_user_id(user_id=share_data.owner_id)
-        owner_settings = await self._settings_service.get_settings(user_id=owner_user.id)
+    async def get_external_time_slots_range(
+            self,
+            user_id: UUID,
+            owner_token: str,
+            start_date: date,
+            end_date: date
+    ) -> List[ExternalDayTimeSlots]:
+        self.validate_date_range(start_date=start_date, end_date=end_date)
+
+        shared_owner = await self._share_service.resolve_owner(token=owner_token)
+
+        if shared_owner is None:
+            raise ShareTokenDoesNotExistsError
 
-        if not self.is_working_day(
-                target_date=target_date,
-                working_days_bitmask=owner_settings.working_days
-        ):
-            return []
+        owner_user = shared_owner.owner
+        owner_settings = shared_owner.owner_settings
 
         invited_user = await self._user_service.get_by_user_id(user_id=user_id)
         if invited_user is None:
@@ -397,68 +403,69 @@ class TimeSlotsFacade:
 
         invited_settings = await self._settings_service.get_settings(user_id=invited_user.id)
 
-        if not self.is_working_day(
-                target_date=target_date,
-                working_days_bitmask=invited_settings.working_days
-        ):
-            return []
-
-        owner_booked_slots = await self._time_slots_service.get_time_self_slots(
-            user_id=owner_user.id,
-            target_date=target_date
+        # Всё считается в минутах от локальной полуночи владельца за start_date:
+        # сетка строится в его рабочем времени, занятость обоих участников
+        # берётся битовыми масками за те же локальные сутки всего периода.
+        range_start_at, _ = self._time_slots_service.local_day_bounds(
+            target_date=start_date,
+            tz_offset_hours=owner_settings.timezone
         )
-
-        for slot in owner_booked_slots:
-            slot.meet_start_at = self.from_utc_naive(
-                dt_utc=slot.meet_start_at,
-                tz_offset_hours=invited_settings.timezone
-            )
-            slot.meet_end_at = self.from_utc_naive(
-                dt_utc=slot.meet_end_at,
-                tz_offset_hours=invited_settings.timezone
-            )
-
-        invited_booked_slots = await self._time_slots_service.get_time_self_slots(
-            user_id=invited_user.id,
-            target_date=target_date
+        _, range_end_at = self._time_slots_service.local_day_bounds(
+            target_date=end_date,
+            tz_offset_hours=owner_settings.timezone
         )
 
-        for slot in invited_booked_slots:
-            slot.meet_start_at = self.from_utc_naive(
-                dt_utc=slot.meet_start_at,
-                tz_offset_hours=invited_settings.timezone
-            )
-            slot.meet_end_at = self.from_utc_naive(
-                dt_utc=slot.meet_end_at,
-                tz_offset_hours=invited_settings.timezone
-            )
+        busy_masks = await self._busy_bitmap_service.get_busy_masks(
+            user_ids=[owner_user.id, invited_user.id],
+            start_at=range_start_at,
+            end_at=range_end_at
+        )
+        busy_mask = busy_masks[owner_user.id] | busy_masks[invited_user.id]
 
-        all_owner_slots = self.generate_daily_time_slots(
+        owner_grid = self.generate_daily_time_slots(
             work_time_start=owner_settings.work_time_start,
             work_time_end=owner_settings.work_time_end,
             duration_minutes=owner_settings.duration_minutes
         )
 
-        available_external_slots = self.get_available_external_slots(
-            all_slots=all_owner_slots,
-            owner_booked_slots=owner_booked_slots,
-            invited_booked_slots=invited_booked_slots
-        )
+        # Переводим в локальное время приглашённого и оставляем слоты внутри его рабочего дня
+        shift_minutes = (invited_settings.timezone - owner_settings.timezone) * 60
+        invited_work_start = float_time_to_minutes(invited_settings.work_time_start)
+        invited_work_end = float_time_to_minutes(invited_settings.work_time_end)
+
+        days = []
+        for day_index in range((end_date - start_date).days + 1):
+            target_date = start_date + timedelta(days=day_index)
+            filtered_slots = []
+
+            if self.is_working_day(
+                    target_date=target_date,
+                    working_days_bitmask=owner_settings.working_days
+            ) and self.is_working_day(
+                    target_date=target_date,
+                    working_days_bitmask=invited_settings.working_days
+            ):
+                free_slot_starts = self.get_available_external_slots(
+                    grid=owner_grid,
+                    duration_minutes=owner_settings.duration_minutes,
+                    day_offset=day_index * MINUTES_PER_DAY,
+                    busy_mask=busy_mask
+                )
 
-        for slot in available_external_slots:
-            slot.meet_start_at -= owner_settings.timezone - invited_settings.timezone
-            slot.meet_end_at -= owner_settings.timezone - invited_settings.timezone
+                for slot_start in free_slot_starts:
+                    start_min = slot_start + shift_minutes
+                    end_min = start_min + owner_settings.duration_minutes
+                    if invited_work_start <= start_min and end_min <= invited_work_end:
+                        filtered_slots.append(
+                            GetExternalTimeSlot(
+                                meet_start_at=minutes_to_float_time(start_min),
+                                meet_end_at=minutes_to_float_time(end_min)
+                            )
+                        )
 
-        filtered_slots = []
-        for slot in available_external_slots:
-            if (
-                    invited_settings.work_time_start <= slot.meet_start_at < invited_settings.work_time_end
-                    and
-                    invited_settings.work_time_start < slot.meet_end_at <= invited_settings.work_time_end
-            ):
-                filtered_slots.append(slot)
+            days.append(ExternalDayTimeSlots(date=target_date, time_slots=filtered_slots))
 
-        return filtered_slots
+        return days
 
     async def update_time_slot(
             self,
@@ -481,43 +488,131 @@ class TimeSlotsFacade:
         if meeting_url:
             update_data['meeting_url'] = meeting_url
 
-        if confirm:
-            meeting_url = await self._sber_jazz_client.create_meeting(
-                user_id=time_slot.owner_id,
-                title=time_slot.title,
-                description=time_slot.description
+        try:
+            updated_time_slot = await self._time_slots_service.update_time_slot(
+                time_slot_id=time_slot_id,
+                update_data=update_data
             )
-            update_data['meeting_url'] = meeting_url
+        except TimeSlotOverlapError:
+            self._busy_bitmap_service.invalidate(time_slot)
+            raise
 
-        updated_time_slot = await self._time_slots_service.update_time_slot(
-            time_slot_id=time_slot_id,
-            update_data=update_data
-        )
+        if confirm:
+            self._busy_bitmap_service.mark_busy(updated_time_slot)
+        elif confirm is not None:
+            self._busy_bitmap_service.invalidate(updated_time_slot)
+
+        if confirm is not None:
+            # Уведомление не ждёт ссылку: она придёт отдельным сообщением
+            await self._send_confirm_notification(time_slot=updated_time_slot, confirm=confirm)
 
-        invited_user = await self._user_service.get_by_user_id(user_id=updated_time_slot.invited_id)
-        owner_user = await self._user_service.get_by_user_id(user_id=updated_time_slot.owner_id)
+        if confirm and not updated_time_slot.meeting_url:
+            self._schedule_meeting_provision(time_slot_id=time_slot_id)
 
-        invited_user_settings = await self._settings_service.get_settings(user_id=invited_user.id)
-        owner_user_settings = await self._settings_service.get_settings(user_id=owner_user.id)
+        return updated_time_slot
 
-        if confirm is not None:
-            await confirm_time_slot_signal.send_async(
-                ConfirmTimeSlotNotification(
-                    meet_start_at=updated_time_slot.meet_start_at,
-                    meet_end_at=updated_time_slot.meet_end_at,
-                    title=updated_time_slot.title,
-                    invite_user_max_id=invited_user.max_id,
-                    invite_use_name=invited_user.name,
-                    invite_timezone=invited_user_settings.timezone,
-                    owner_user_max_id=owner_user.max_id,
-                    owner_user_user_name=owner_user.name,
-                    owner_timezone=owner_user_settings.timezone,
-                    confirm=confirm,
-                    meeting_url=meeting_url
+    def _schedule_meeting_provision(self, time_slot_id: UUID):
+        # Повторное подтверждение во время повторов не создаёт вторую встречу
+        task = self._provision_tasks.get(time_slot_id)
+        if task is not None and not task.done():
+            return
+
+        task = asyncio.create_task(self.provision_meeting(time_slot_id=time_slot_id))
+        self._provision_tasks[time_slot_id] = task
+        task.add_done_callback(lambda done: self._on_provision_done(time_slot_id, done))
+
+    def _on_provision_done(self, time_slot_id: UUID, task: asyncio.Task):
+        self._provision_tasks.pop(time_slot_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            # Аренда не снята, поэтому после её истечения cron повторит попытку
+            logging.error(
+                f"Ошибка при создании ссылки для слота {time_slot_id}",
+                exc_info=task.exception()
+            )
+
+    async def provision_meeting(self, time_slot_id: UUID):
+        """
+        Создаёт встречу в Salute Jazz с повторами и присылает участникам ссылку.
+        Соединение с БД держится только на время коротких запросов до и после
+        повторов, а не на всё время ожидания внешнего сервиса.
+        """
+        async with db(name="provision_meeting"):
+            # Аренда в БД защищает от второй встречи с другого воркера или из cron
+            if not await self._time_slots_service.claim_meeting_provision(time_slot_id=time_slot_id):
+                return
+            time_slot = await self._time_slots_service.get_time_slot(time_slot_id=time_slot_id)
+
+        meeting_url = None
+        for attempt in range(1, settings.meeting_provision_attempts + 1):
+            try:
+                meeting_url = await self._sber_jazz_client.create_meeting(
+                    user_id=time_slot.owner_id,
+                    title=time_slot.title,
+                    description=time_slot.description
+                )
+                break
+            except Exception as e:
+                logging.warning(
+                    f"Не удалось создать встречу для слота {time_slot_id}, "
+                    f"попытка {attempt}/{settings.meeting_provision_attempts}: {e}"
                 )
+                if attempt < settings.meeting_provision_attempts:
+                    await asyncio.sleep(settings.meeting_provision_backoff_seconds * 2 ** (attempt - 1))
+
+        if not meeting_url:
+            # Аренда остаётся: после её истечения слот подберёт cron
+            return
+
+        async with db(name="provision_meeting"):
+            # Пока создавалась встреча, слот могли отменить
+            time_slot = await self._time_slots_service.set_meeting_url(
+                time_slot_id=time_slot_id,
+                meeting_url=meeting_url
             )
+            if time_slot is None:
+                return
 
-        return updated_time_slot
+            await self._send_confirm_notification(
+                time_slot=time_slot,
+                confirm=True,
+                signal=meeting_link_signal
+            )
+
+    async def provision_missing_meetings(self):
+        """ Для cron: подтверждённые встречи без ссылки, чья аренда истекла или не заявлялась. """
+        time_slot_ids = await self._time_slots_service.get_missing_meeting_url_ids()
+        for time_slot_id in time_slot_ids:
+            self._schedule_meeting_provision(time_slot_id=time_slot_id)
+
+    async def _send_confirm_notification(
+            self,
+            time_slot: TimeSlotsModelPydantic,
+            confirm: bool,
+            signal=confirm_time_slot_signal
+    ):
+        invited_user, owner_user = await self._user_service.get_by_user_ids(
+            user_ids=[time_slot.invited_id, time_slot.owner_id]
+        )
+
+        invited_user_settings, owner_user_settings = await self._settings_service.get_settings_many(
+            user_ids=[invited_user.id, owner_user.id]
+        )
+
+        await signal.send_async(
+            ConfirmTimeSlotNotification(
+                meet_start_at=time_slot.meet_start_at,
+                meet_end_at=time_slot.meet_end_at,
+                title=time_slot.title,
+                invite_user_max_id=invited_user.max_id,
+                invite_use_name=invited_user.name or UNKNOWN_USER_NAME,
+                invite_timezone=invited_user_settings.timezone,
+                owner_user_max_id=owner_user.max_id,
+                owner_user_user_name=owner_user.name or UNKNOWN_USER_NAME,
+                owner_timezone=owner_user_settings.timezone,
+                confirm=confirm,
+                meeting_url=time_slot.meeting_url
+            )
+        )
 
     async def delete_self_time_slot(self, user_id: UUID, time_slot_id: UUID):
         invited_user = await self._user_service.get_by_user_id(user_id=user_id)
@@ -531,92 +626,49 @@ class TimeSlotsFacade:
 
         await self.update_time_slot(time_slot_id=time_slot_id, confirm=False)
 
-    def is_time_to_alert(self, meet_start_at: datetime, alert_offset_minutes: int) -> bool:
-        now = datetime.now(timezone.utc).replace(tzinfo=None)
-
-        if meet_start_at.tzinfo is None:
-            meet_start_at = meet_start_at.replace()
-        else:
-            meet_start_at = meet_start_at.astimezone()
-
-        now = now.replace(second=0, microsecond=0)
-        meet_start_at = meet_start_at.replace(second=0, microsecond=0)
-
-        alert_time = meet_start_at - timedelta(minutes=alert_offset_minutes)
-        alert_time = alert_time.replace(second=0, microsecond=0)
-        return alert_time == now and now < meet_start_at
-
     async def check_reminders(self):
-        upcoming_time_slots = await self._time_slots_service.get_upcoming()
+        current_time = datetime.now(timezone.utc).replace(tzinfo=None)
 
-        for slot in upcoming_time_slots:
-            owner_settings = await self._settings_service.get_settings(
-                user_id=slot.owner_id
-            )
-            invited_settings = await self._settings_service.get_settings(
-                user_id=slot.invited_id
-            )
-
-            send_notification_to_owner = self.is_time_to_alert(
-                meet_start_at=slot.meet_start_at,
-                alert_offset_minutes=owner_settings.alert_offset_minutes
-            )
+        # Отправляем всё, что наступило после прошлого завершённого тика: опоздавший
+        # или пропущенный запуск cron не теряет напоминания. Строки time_slot_alert
+        # заявляются до отправки, поэтому пересекающиеся тики не шлют их дважды.
+        # Доставка не более одного раза: неудачная отправка остаётся заявленной
+        # и не повторяется, она только логируется.
+        due_alerts = await self._time_slot_alert_service.get_due_alerts(current_time=current_time)
 
-            send_notification_to_invited = self.is_time_to_alert(
-                meet_start_at=slot.meet_start_at,
-                alert_offset_minutes=invited_settings.alert_offset_minutes
-            )
+        claimed = await self._time_slot_alert_service.claim_alerts(
+            alerts=[(alert.user_id, alert.time_slot_id) for alert in due_alerts]
+        )
 
-            if send_notification_to_owner or send_notification_to_invited:
-                owner_user = await self._user_service.get_by_user_id(user_id=slot.owner_id)
-                invited_user = await self._user_service.get_by_user_id(user_id=slot.invited_id)
-
-                if send_notification_to_owner:
-                    if await self._time_slot_alert_service.get_by_user_id_and_time_slot_id(
-                            user_id=owner_user.id,
-                            time_slot_id=slot.id
-                    ) is None:
-                        await alert_before_meet_signal.send_async(
-                            MeetAlertNotification(
-                                meet_start_at=slot.meet_start_at,
-                                meet_end_at=slot.meet_end_at,
-                                title=slot.title,
-                                invite_use_name=invited_user.name,
-                                user_max_id=owner_user.max_id,
-                                user_timezone=owner_settings.timezone,
-                                meeting_url=slot.meeting_url,
-                                alert_offset_minutes=owner_settings.alert_offset_minutes
-                            )
-                        )
-                        await self._time_slot_alert_service.create_alert(
-                            user_id=owner_user.id,
-                            time_slot_id=slot.id
-                        )
+        for alert in due_alerts:
+            if (alert.user_id, alert.time_slot_id) not in claimed:
+                continue
+
+            # Ошибка одного напоминания не прерывает отправку остальных
+            try:
+                await alert_before_meet_signal.send_async(self._meet_alert_notification(alert))
+            except Exception:
+                logging.exception(
+                    f"Не удалось отправить напоминание о слоте {alert.time_slot_id} "
+                    f"пользователю {alert.user_id}"
+                )
 
-                if send_notification_to_invited:
-                    if await self._time_slot_alert_service.get_by_user_id_and_time_slot_id(
-                            user_id=invited_user.id,
-                            time_slot_id=slot.id
-                    ) is None:
-                        await alert_before_meet_signal.send_async(
-                            MeetAlertNotification(
-                                meet_start_at=slot.meet_start_at,
-                                meet_end_at=slot.meet_end_at,
-                                title=slot.title,
-                                invite_use_name=owner_user.name,
-                                user_max_id=invited_user.max_id,
-                                user_timezone=invited_settings.timezone,
-                                meeting_url=slot.meeting_url,
-                                alert_offset_minutes=invited_settings.alert_offset_minutes
-                            )
-                        )
-                        await self._time_slot_alert_service.create_alert(
-                            user_id=invited_user.id,
-                            time_slot_id=slot.id
-                        )
+        await self._time_slot_alert_service.mark_processed(processed_until=current_time)
+
+    @staticmethod
+    def _meet_alert_notification(alert: DueTimeSlotAlert) -> MeetAlertNotification:
+        return MeetAlertNotification(
+            meet_start_at=alert.meet_start_at,
+            meet_end_at=alert.meet_end_at,
+            title=alert.title,
+            invite_use_name=alert.companion_name or UNKNOWN_USER_NAME,
+            user_max_id=alert.user_max_id,
+            user_timezone=alert.user_timezone,
+            meeting_url=alert.meeting_url,
+            alert_offset_minutes=alert.alert_offset_minutes
+        )
 
-    def resolve_date(self, parsed_data: dict) -> datetime.date:
-        today = datetime.now().date()
+    def resolve_date(self, parsed_data: dict, today: date) -> date:
 
         if parsed_data.get("date"):
             return datetime.fromisoformat(parsed_data["date"]).date()
@@ -657,11 +709,20 @@ class TimeSlotsFacade:
             user_max_id: int
     ) -> UUID:
         user = await self._user_service.find_by_max_id(max_id=user_max_id)
+        if user is None:
+            raise UserDoesNotExistsError
+
         parsed_data = await self._gigachat_client.parse_message(message=text_message)
         if parsed_data is None:
             raise TextParserError
 
-        date_slot = self.resolve_date(parsed_data)
+        user_settings = await self._settings_service.get_settings(user_id=user.id)
+        today = self.from_utc_naive(
+            dt_utc=datetime.now(timezone.utc).replace(tzinfo=None),
+            tz_offset_hours=user_settings.timezone
+        ).date()
+
+        date_slot = self.resolve_date(parsed_data, today=today)
         start_dt = self.parse_time_to_datetime(date_slot, parsed_data["meet_start_at"])
         end_dt = self.resolve_end_time(start_dt, parsed_data.get("meet_end_at"))
 
@@ -676,45 +737,36 @@ class TimeSlotsFacade:
     async def daily_reminder(self):
         settings_list = await self._settings_service.get_users_with_current_reminder_time()
 
-        for settings in settings_list:
-            slot_list = []
+        due_alerts = await self._daily_alert_service.get_due_alerts(
+            user_ids=[settings.user_id for settings in settings_list]
+        )
 
-            booked_slots = await self._time_slots_service.get_time_self_slots(
-                user_id=settings.user_id,
-                target_date=datetime.now().date()
-            )
+        # Как и в check_reminders, сводка доставляется не более одного раза
+        claimed = await self._daily_alert_service.claim_alerts(
+            alerts=[(alert.user_id, alert.time_slot_id) for alert in due_alerts]
+        )
 
-            unique_slots = {slot.id: slot for slot in booked_slots}.values()
-            unique_slots = list(unique_slots)
-
-            for slot in unique_slots:
-                if await self._daily_alert_service.get_by_user_id_and_time_slot_id(
-                        user_id=settings.user_id,
-                        time_slot_id=slot.id
-                ) is None:
-                    invited_user = await self._user_service.get_by_user_id(user_id=slot.invited_id)
-                    owner_user = await self._user_service.get_by_user_id(user_id=settings.user_id)
-                    slot_list.append(
-                        MeetAlertNotification(
-                            meet_start_at=slot.meet_start_at,
-                            meet_end_at=slot.meet_end_at,
-                            title=slot.title,
-                            invite_use_name=invited_user.name,
-                            user_max_id=owner_user.max_id,
-                            user_timezone=settings.timezone,
-                            meeting_url=slot.meeting_url,
-                            alert_offset_minutes=settings.alert_offset_minutes
-                        )
+        # Строки приходят отсортированными по пользователю и началу встречи
+        slots_by_user: dict[UUID, List[MeetAlertNotification]] = {}
+        for alert in due_alerts:
+            if (alert.user_id, alert.time_slot_id) not in claimed:
+                continue
+
+            try:
+                notification = self._meet_alert_notification(alert)
+            except Exception:
+                logging.exception(f"Некорректные данные слота {alert.time_slot_id} для ежедневной сводки")
+                continue
+
+            slots_by_user.setdefault(alert.user_id, []).append(notification)
+
+        for user_id, slot_list in slots_by_user.items():
+            try:
+                await daily_reminder_signal.send_async(
+                    DailyReminderNotification(
+                        slot_list=slot_list
                     )
-                    await self._daily_alert_service.create_alert(
-                        user_id=settings.user_id,
-                        time_slot_id=slot.id
-                    )
-
-            sorted_slots = sorted(slot_list, key=lambda slot: slot.meet_start_at)
-
-            await daily_reminder_signal.send_async(
-                DailyReminderNotification(
-                    slot_list=sorted_slots
                 )
-            )
+            except Exception:
+                logging.exception(f"Не удалось отправить ежедневную сводку пользователю {user_id}")
+
@@ -0,0 +1,64 @@
+import math
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Tuple, List, Sequence
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def minutes_since(dt: datetime, origin: datetime) -> int:
+    """ Целые минуты от origin до dt, отрицательные для моментов раньше origin. """
+    return (dt - origin) // timedelta(minutes=1)
+
+
+def float_time_to_minutes(t: float) -> int:
+    """ 14.30 -> 870 """
+    hours = int(math.floor(t))
+    minutes = int(round((t - hours) * 100))
+    if minutes < 0 or minutes >= 60:
+        raise ValueError(f"Некорректное значение минут: {minutes} (вход: {t})")
+    return hours * 60 + minutes
+
+
+def minutes_to_float_time(m: int) -> float:
+    """ 870 -> 14.30 """
+    hours, minutes = divmod(m, 60)
+    return round(hours + minutes / 100, 2)
+
+
+@lru_cache(maxsize=1024)
+def daily_slot_grid(start_min: int, end_min: int, duration_minutes: int) -> Tuple[int, ...]:
+    """
+    Начала слотов рабочего дня в минутах от полуночи.
+    Сетка зависит только от настроек, поэтому кэшируется на весь процесс.
+    """
+    if end_min <= start_min:
+        raise ValueError("work_time_end должен быть больше work_time_start")
+    if duration_minutes <= 0:
+        raise ValueError("duration_minutes должен быть больше нуля")
+
+    return tuple(range(start_min, end_min - duration_minutes + 1, duration_minutes))
+
+
+def interval_mask(start_min: int, end_min: int, size: int) -> int:
+    """ Битовая маска минут [start_min, end_min), обрезанная до [0, size). """
+    start_min = max(start_min, 0)
+    end_min = min(end_min, size)
+    if end_min <= start_min:
+        return 0
+    return ((1 << (end_min - start_min)) - 1) << start_min
+
+
+def free_grid_slots_mask(
+        grid: Sequence[int],
+        duration_minutes: int,
+        busy_mask: int
+) -> List[int]:
+    """ Начала слотов сетки, все минуты которых свободны в busy_mask (бит i - минута i). """
+    slot_mask = (1 << duration_minutes) - 1
+    return [
+        slot_start
+        for slot_start in grid
+        if not (busy_mask >> slot_start) & slot_mask
+    ]
@@ -0,0 +1,83 @@
+import asyncio
+from typing import Generic, TypeVar, Callable, Awaitable, Dict, List, Optional, Hashable
+
+from backend.database import db
+
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+class _LoaderState(Generic[_K, _V]):
+    def __init__(self):
+        self.futures: Dict[_K, asyncio.Future] = {}
+        self.queue: List[_K] = []
+
+
+class RequestLoader(Generic[_K, _V]):
+    """
+    DataLoader в рамках текущего контекста db.
+
+    Ключи, запрошенные в одном такте event loop, собираются в один пакетный
+    запрос, а результаты запоминаются до конца запроса или фоновой задачи,
+    так что повторные обращения к тем же сущностям не ходят в БД.
+    """
+
+    def __init__(self, name: str, batch_load: Callable[[List[_K]], Awaitable[Dict[_K, _V]]]):
+        self._info_key = f"loader:{name}"
+        self._batch_load = batch_load
+
+    def _state(self) -> _LoaderState[_K, _V]:
+        # Состояние живёт в контексте, а не в сессии: попадания в кэш не открывают соединение
+        info = db.info
+        state = info.get(self._info_key)
+        if state is None:
+            state = _LoaderState()
+            info[self._info_key] = state
+        return state
+
+    async def load(self, key: _K) -> Optional[_V]:
+        state = self._state()
+
+        future = state.futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            state.futures[key] = future
+            state.queue.append(key)
+
+            # Первый ключ в такте планирует пакетную загрузку, остальные к ней присоединяются
+            if len(state.queue) == 1:
+                loop.call_soon(asyncio.ensure_future, self._dispatch(state))
+
+        return await future
+
+    async def load_many(self, keys: List[_K]) -> List[Optional[_V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: _K, value: Optional[_V]) -> None:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._state().futures[key] = future
+
+    def clear(self, key: _K) -> None:
+        self._state().futures.pop(key, None)
+
+    async def _dispatch(self, state: _LoaderState[_K, _V]) -> None:
+        keys, state.queue = state.queue, []
+        futures = [state.futures[key] for key in keys]
+
+        try:
+            values = await self._batch_load(keys)
+        except Exception as e:
+            for key, future in zip(keys, futures):
+                # Неудачную загрузку не запоминаем, следующий вызов повторит запрос
+                if state.futures.get(key) is future:
+                    del state.futures[key]
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in zip(keys, futures):
+            if not future.done():
+                future.set_result(values.get(key))
@@ -1,4 +1,6 @@
 import os
+from contextlib import asynccontextmanager
+
 import uvicorn
 
 from dotenv import load_dotenv
@@ -8,6 +10,7 @@ if os.path.exists('.env'):
     load_dotenv('.env')
 
 from backend.database import AsyncDBSessionMiddleware
+from backend.metrics import MetricsMiddleware
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,6 +18,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from backend.settings.settings import settings
 from backend.api.routers import api_router_external, api_router_internal
 from backend.enums.profile_enum import Profile
+from backend.dependes import get_sber_jazz_client
 
 from pathlib import Path
 
@@ -28,10 +32,16 @@ with backend.lock():
     backend.apply_migrations(backend.to_apply(migrations))
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await get_sber_jazz_client().close()
+
+
 if settings.profile == Profile.PROD:
-    app = FastAPI(openapi_prefix="/", docs_url=None, redoc_url=None, openapi_url=None)
+    app = FastAPI(openapi_prefix="/", lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
 else:
-    app = FastAPI(openapi_prefix="/")
+    app = FastAPI(openapi_prefix="/", lifespan=lifespan)
 
 # Middlewares
 app.add_middleware(
@@ -50,6 +60,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    MetricsMiddleware,
+)
 
 # Routers
 app.include_router(api_router_external)
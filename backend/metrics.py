@@ -0,0 +1,212 @@
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Sequence, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # метки -> (счётчики по корзинам, сумма, количество)
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        state = self._values.get(key)
+        if state is None:
+            state = [[0] * len(self.buckets), 0.0, 0]
+            self._values[key] = state
+
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            state[0][index] += 1
+        state[1] += value
+        state[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, (bucket_counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """ Метрики процесса в текстовом формате Prometheus. """
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Histogram:
+        metric = Histogram(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+http_request_errors = registry.counter(
+    "http_request_errors_total", "HTTP requests failed with an unhandled exception", ("method", "route")
+)
+db_query_seconds = registry.histogram(
+    "db_query_duration_seconds", "SQL statement latency by statement type", ("operation",)
+)
+db_query_errors = registry.counter(
+    "db_query_errors_total", "SQL statements failed with an error", ("operation",)
+)
+external_call_seconds = registry.histogram(
+    "external_call_duration_seconds", "Latency of calls to external services", ("service", "operation")
+)
+external_call_errors = registry.counter(
+    "external_call_errors_total", "Failed calls to external services", ("service", "operation")
+)
+
+
+@contextmanager
+def track_call(service: str, operation: str) -> Iterator[None]:
+    started_at = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        external_call_errors.inc(service=service, operation=operation)
+        raise
+    finally:
+        external_call_seconds.observe(time.perf_counter() - started_at, service=service, operation=operation)
+
+
+def _statement_operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """ Подписывает sync-движок (async_engine.sync_engine) на замер SQL-запросов. """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics:started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_at = conn.info["metrics:started_at"].pop()
+        db_query_seconds.observe(time.perf_counter() - started_at, operation=_statement_operation(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        stack = exception_context.connection.info.get("metrics:started_at") if exception_context.connection else None
+        if stack:
+            stack.pop()
+        statement = exception_context.statement or ""
+        db_query_errors.inc(operation=_statement_operation(statement))
+
+
+class MetricsMiddleware:
+    """ ASGI middleware: время обработки запроса по шаблону маршрута. """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            http_request_errors.inc(method=scope["method"], route=self._route(scope))
+            raise
+        finally:
+            http_request_seconds.observe(
+                time.perf_counter() - started_at,
+                method=scope["method"],
+                route=self._route(scope),
+                status=status
+            )
+
+    @staticmethod
+    def _route(scope: Scope) -> str:
+        # Шаблон пути, а не сам путь: токены и даты не раздувают число рядов
+        route = scope.get("route")
+        return getattr(route, "path_format", None) or getattr(route, "path", None) or "<unmatched>"
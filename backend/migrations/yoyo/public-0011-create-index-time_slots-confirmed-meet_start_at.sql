@@ -0,0 +1,4 @@
+-- Частичный индекс для выборки ближайших подтверждённых встреч в напоминаниях
+CREATE INDEX IF NOT EXISTS idx_time_slots_confirmed_meet_start_at
+    ON public.time_slots(meet_start_at)
+    WHERE confirm;
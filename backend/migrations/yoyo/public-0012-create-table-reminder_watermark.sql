@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS public.reminder_watermark (
+    id UUID PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    processed_until TIMESTAMP NOT NULL,
+    CONSTRAINT reminder_watermark_name_key UNIQUE (name)
+);
@@ -0,0 +1,56 @@
+-- Защита от пересечений подтверждённых встреч на уровне БД. Каждый подтверждённый
+-- слот раскладывается триггером на участников (владелец и приглашённый), а
+-- GiST-ограничение исключения не даёт одному пользователю две пересекающиеся встречи.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+CREATE TABLE IF NOT EXISTS public.time_slot_participant (
+    time_slot_id UUID NOT NULL,
+    user_id UUID NOT NULL,
+    during TSRANGE NOT NULL,
+    CONSTRAINT time_slot_participant_pkey PRIMARY KEY (time_slot_id, user_id),
+    CONSTRAINT time_slot_participant_time_slot_id_fkey FOREIGN KEY (time_slot_id)
+        REFERENCES public.time_slots(id) ON DELETE CASCADE,
+    CONSTRAINT time_slot_participant_no_overlap
+        EXCLUDE USING gist (user_id WITH =, during WITH &&)
+);
+
+CREATE OR REPLACE FUNCTION public.time_slots_sync_participants() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        -- Правка названия или ссылки не трогает участников
+        IF NEW.confirm IS NOT DISTINCT FROM OLD.confirm
+            AND NEW.owner_id = OLD.owner_id
+            AND NEW.invited_id = OLD.invited_id
+            AND NEW.meet_start_at IS NOT DISTINCT FROM OLD.meet_start_at
+            AND NEW.meet_end_at IS NOT DISTINCT FROM OLD.meet_end_at THEN
+            RETURN NEW;
+        END IF;
+
+        DELETE FROM public.time_slot_participant WHERE time_slot_id = OLD.id;
+    END IF;
+
+    IF NEW.confirm AND NEW.meet_end_at > NEW.meet_start_at THEN
+        INSERT INTO public.time_slot_participant (time_slot_id, user_id, during)
+        SELECT NEW.id, participants.user_id, tsrange(NEW.meet_start_at, NEW.meet_end_at, '[)')
+        FROM (SELECT NEW.owner_id AS user_id UNION SELECT NEW.invited_id) AS participants;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER time_slots_sync_participants
+    AFTER INSERT OR UPDATE ON public.time_slots
+    FOR EACH ROW EXECUTE FUNCTION public.time_slots_sync_participants();
+
+-- Уже существующие пересечения не ломают миграцию: более поздние конфликтующие
+-- строки пропускаются и будут проверены при следующем подтверждении слота
+INSERT INTO public.time_slot_participant (time_slot_id, user_id, during)
+SELECT time_slots.id, participants.user_id, tsrange(time_slots.meet_start_at, time_slots.meet_end_at, '[)')
+FROM public.time_slots
+CROSS JOIN LATERAL (
+    SELECT time_slots.owner_id AS user_id UNION SELECT time_slots.invited_id
+) AS participants
+WHERE time_slots.confirm AND time_slots.meet_end_at > time_slots.meet_start_at
+ORDER BY time_slots.created_at NULLS FIRST
+ON CONFLICT DO NOTHING;
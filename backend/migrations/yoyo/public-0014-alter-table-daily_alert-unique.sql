@@ -0,0 +1,10 @@
+-- Повторные ежедневные напоминания схлопываются до самой ранней отправки,
+-- после чего пара (пользователь, слот) становится уникальной
+DELETE FROM public.daily_alert AS duplicate
+USING public.daily_alert AS original
+WHERE duplicate.user_id = original.user_id
+    AND duplicate.time_slot_id = original.time_slot_id
+    AND (duplicate.sent_at, duplicate.id) > (original.sent_at, original.id);
+
+ALTER TABLE public.daily_alert
+ADD CONSTRAINT daily_alert_unique UNIQUE (user_id, time_slot_id);
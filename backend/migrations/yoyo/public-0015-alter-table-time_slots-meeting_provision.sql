@@ -0,0 +1,9 @@
+-- Аренда на создание ссылки на встречу: фоновую задачу запускает только тот,
+-- кто заявил слот, а cron подбирает подтверждённые слоты без ссылки после
+-- истечения аренды (например, если процесс перезапустился во время повторов).
+ALTER TABLE public.time_slots
+    ADD COLUMN IF NOT EXISTS meeting_provision_claimed_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_time_slots_confirmed_without_meeting_url
+    ON public.time_slots(meet_end_at)
+    WHERE confirm AND meeting_url IS NULL;
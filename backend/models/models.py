@@ -53,6 +53,7 @@ class TimeSlots(Base):
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     meeting_url = Column(String, nullable=True)
+    meeting_provision_claimed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, nullable=True, default=datetime.now())
 
 
@@ -89,3 +90,11 @@ class Onboarding(Base):
     id = Column(UUID, primary_key=True)
     user_id = Column(UUID, ForeignKey('user.id', ondelete='CASCADE'))
     created_at = Column(DateTime, nullable=False)
+
+
+class ReminderWatermark(Base):
+    __tablename__ = "reminder_watermark"
+
+    id = Column(UUID, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+    processed_until = Column(DateTime, nullable=False)
@@ -4,7 +4,8 @@ from typing import Optional, List, TypeVar, Generic, Any
 from uuid import UUID
 
 from sqlalchemy.future import select
-from sqlalchemy import delete, update
+from sqlalchemy import delete, update, inspect
+from sqlalchemy.dialects.postgresql import insert
 
 import typing_inspect
 from backend.database import db
@@ -41,24 +42,89 @@ class CrudRepository(Generic[_T, _ID]):
         else:
             return await self._update(entity)
 
+    def _bulk_rows(self, entities: List[_T]) -> List[dict]:
+        columns = [attr.key for attr in inspect(self.entity_class).column_attrs]
+        now = datetime.now()
+
+        rows = []
+        for entity in entities:
+            if self.id_type == UUID and entity.id is None:
+                entity.id = uuid.uuid4()
+            if hasattr(entity, 'created_at') and entity.created_at is None:
+                entity.created_at = now
+            if hasattr(entity, 'updated_at') and entity.updated_at is None:
+                entity.updated_at = now
+            rows.append({column: getattr(entity, column) for column in columns})
+
+        # В многострочном VALUES набор колонок общий; колонки, не заданные
+        # ни в одной сущности, остаются на дефолты БД
+        keys = [column for column in columns if any(row[column] is not None for row in rows)]
+        return [{key: row[key] for key in keys} for row in rows]
+
+    async def save_many(self, entities: List[_T]) -> List[_T]:
+        """ Вставляет сущности одним INSERT ... RETURNING и одним коммитом. """
+        if not entities:
+            return []
+
+        stmt = insert(self.entity_class).values(self._bulk_rows(entities)).returning(self.entity_class)
+        result = await db.session.execute(stmt)
+        saved = result.scalars().all()
+        await db.session.commit()
+        return saved
+
+    async def upsert_many(
+            self,
+            entities: List[_T],
+            constraint: Optional[str] = None,
+            index_elements: Optional[List[str]] = None,
+            update_columns: Optional[List[str]] = None
+    ) -> List[_T]:
+        """
+        INSERT ... ON CONFLICT ... RETURNING одним запросом. Без update_columns
+        конфликтующие строки пропускаются и в результат не попадают.
+        """
+        if not entities:
+            return []
+
+        stmt = insert(self.entity_class).values(self._bulk_rows(entities))
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                constraint=constraint,
+                index_elements=index_elements,
+                set_={column: stmt.excluded[column] for column in update_columns}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(
+                constraint=constraint,
+                index_elements=index_elements
+            )
+
+        stmt = stmt.returning(self.entity_class).execution_options(populate_existing=True)
+        result = await db.session.execute(stmt)
+        saved = result.scalars().all()
+        await db.session.commit()
+        return saved
+
     async def update(self, entity_id: _ID, data: dict) -> Optional[_T]:
-        stmt_select = select(self.entity_class).where(self.entity_class.id == entity_id)
-        result_select = await db.session.execute(stmt_select)
-        entity = result_select.scalar_one_or_none()
+        update_data = {k: v for k, v in data.items() if k not in ["id", "created_at"]}
+        if not update_data:
+            return await self.find_by_id(entity_id=entity_id)
+
+        # Один UPDATE ... RETURNING вместо проверки существования и перечитывания строки
+        stmt_update = (
+            update(self.entity_class)
+            .where(self.entity_class.id == entity_id)
+            .values(**update_data)
+            .returning(self.entity_class)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.session.execute(stmt_update)
+        entity = result.scalar_one_or_none()
 
         if entity is None:
             return None
 
-        update_data = {k: v for k, v in data.items() if k not in ["id", "created_at"]}
-        stmt_update = update(self.entity_class).where(self.entity_class.id == entity_id).values(
-            **update_data)
-        await db.session.execute(stmt_update)
         await db.session.commit()
-
-        stmt_select = select(self.entity_class).where(self.entity_class.id == entity_id)
-        result_select = await db.session.execute(stmt_select)
-        entity = result_select.scalar_one_or_none()
-
         return entity
 
     async def find_by_id(self, entity_id: _ID, options = None) -> Optional[_T]:
@@ -68,21 +134,29 @@ class CrudRepository(Generic[_T, _ID]):
         result = await db.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def find_by_ids(self, entity_ids: List[_ID]) -> List[_T]:
+        if not entity_ids:
+            return []
+        stmt = select(self.entity_class).where(self.entity_class.id.in_(entity_ids))
+        result = await db.session.execute(stmt)
+        return result.scalars().all()
+
     async def find_all(self) -> List[_T]:
         stmt = select(self.entity_class)
         result = await db.session.execute(stmt)
         return result.scalars().all()
 
     async def delete_by_id(self, entity_id: _ID) -> int:
-        stmt_select = select(self.entity_class).where(self.entity_class.id == entity_id)
-        result_select = await db.session.execute(stmt_select)
-        entity = result_select.scalar_one_or_none()
-
-        if entity is None:
+        stmt_delete = (
+            delete(self.entity_class)
+            .where(self.entity_class.id == entity_id)
+            .returning(self.entity_class.id)
+        )
+        result = await db.session.execute(stmt_delete)
+
+        if result.scalar_one_or_none() is None:
             return 0
 
-        stmt_delete = delete(self.entity_class).where(self.entity_class.id == entity_id)
-        await db.session.execute(stmt_delete)
         await db.session.commit()
         return 1
 
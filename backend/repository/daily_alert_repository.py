@@ -1,27 +1,105 @@
 from uuid import UUID
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import List
 
+from sqlalchemy import and_, func, union_all
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 
 from backend.database import db
-from backend.models.models import DailyAlert
+from backend.models.models import DailyAlert, TimeSlots, Settings, User
 from backend.repository.crud_repository import CrudRepository
-from backend.schemas.time_slot_alert_schema import TimeSlotAlertModelPydantic
+from backend.schemas.time_slot_alert_schema import DueTimeSlotAlert
 
 
 class DailyAlertRepository(CrudRepository[DailyAlert, UUID]):
-    async def find_by_user_id_and_time_slot_id(
+    async def find_due_for_users(
             self,
-            user_id: UUID,
-            time_slot_id: UUID
-    ) -> Optional[TimeSlotAlertModelPydantic]:
-        stmt = select(DailyAlert).where(
-            DailyAlert.user_id == user_id,
-            DailyAlert.time_slot_id == time_slot_id
+            user_ids: List[UUID],
+            current_time: datetime
+    ) -> List[DueTimeSlotAlert]:
+        """
+        Одним запросом собирает встречи всех пользователей за их локальное «сегодня»,
+        которые ещё не попадали в ежедневную сводку.
+        """
+        if not user_ids:
+            return []
+
+        # Начало локального дня пользователя в UTC: сдвигаем текущее время в его
+        # часовой пояс, обрезаем до суток и сдвигаем обратно.
+        tz_offset = func.make_interval(0, 0, 0, 0, Settings.timezone)
+        day_start = func.date_trunc("day", current_time + tz_offset) - tz_offset
+        day_end = day_start + timedelta(days=1)
+
+        participants = union_all(
+            select(
+                TimeSlots.id.label("time_slot_id"),
+                TimeSlots.owner_id.label("user_id"),
+                TimeSlots.invited_id.label("companion_id"),
+                TimeSlots.meet_start_at,
+                TimeSlots.meet_end_at,
+                TimeSlots.title,
+                TimeSlots.meeting_url,
+                Settings.timezone.label("user_timezone"),
+                func.coalesce(Settings.alert_offset_minutes, 0).label("alert_offset_minutes")
+            )
+            .join(Settings, Settings.user_id == TimeSlots.owner_id)
+            .where(
+                Settings.user_id.in_(user_ids),
+                TimeSlots.confirm == True,
+                TimeSlots.meet_start_at >= day_start,
+                TimeSlots.meet_start_at < day_end
+            ),
+            select(
+                TimeSlots.id.label("time_slot_id"),
+                TimeSlots.invited_id.label("user_id"),
+                TimeSlots.owner_id.label("companion_id"),
+                TimeSlots.meet_start_at,
+                TimeSlots.meet_end_at,
+                TimeSlots.title,
+                TimeSlots.meeting_url,
+                Settings.timezone.label("user_timezone"),
+                func.coalesce(Settings.alert_offset_minutes, 0).label("alert_offset_minutes")
+            )
+            .join(Settings, Settings.user_id == TimeSlots.invited_id)
+            .where(
+                Settings.user_id.in_(user_ids),
+                TimeSlots.confirm == True,
+                TimeSlots.invited_id != TimeSlots.owner_id,
+                TimeSlots.meet_start_at >= day_start,
+                TimeSlots.meet_start_at < day_end
+            )
+        ).subquery("participants")
+
+        recipient = aliased(User)
+        companion = aliased(User)
+
+        stmt = (
+            select(
+                participants.c.time_slot_id,
+                participants.c.user_id,
+                recipient.max_id.label("user_max_id"),
+                participants.c.user_timezone,
+                participants.c.alert_offset_minutes,
+                companion.name.label("companion_name"),
+                participants.c.meet_start_at,
+                participants.c.meet_end_at,
+                participants.c.title,
+                participants.c.meeting_url
+            )
+            .join(recipient, recipient.id == participants.c.user_id)
+            .join(companion, companion.id == participants.c.companion_id)
+            .outerjoin(
+                DailyAlert,
+                and_(
+                    DailyAlert.user_id == participants.c.user_id,
+                    DailyAlert.time_slot_id == participants.c.time_slot_id
+                )
+            )
+            .where(DailyAlert.id.is_(None))
+            .order_by(participants.c.user_id, participants.c.meet_start_at.asc())
         )
+
         result = await db.session.execute(stmt)
-        alert_data = result.scalar_one_or_none()
 
-        if alert_data:
-            return TimeSlotAlertModelPydantic.from_orm(alert_data)
-        return None
+        return [DueTimeSlotAlert.model_validate(row) for row in result.mappings().all()]
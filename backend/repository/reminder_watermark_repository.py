@@ -0,0 +1,39 @@
+import uuid
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.database import db
+from backend.models.models import ReminderWatermark
+from backend.repository.crud_repository import CrudRepository
+
+
+class ReminderWatermarkRepository(CrudRepository[ReminderWatermark, UUID]):
+    async def find_processed_until(self, name: str) -> Optional[datetime]:
+        stmt = select(ReminderWatermark.processed_until).where(ReminderWatermark.name == name)
+        result = await db.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def advance(self, name: str, processed_until: datetime) -> None:
+        stmt = insert(ReminderWatermark).values(
+            id=uuid.uuid4(),
+            name=name,
+            processed_until=processed_until
+        )
+        # Водяная отметка только растёт: медленный тик, завершившийся позже быстрого,
+        # не откатывает её назад.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ReminderWatermark.name],
+            set_={
+                "processed_until": func.greatest(
+                    ReminderWatermark.processed_until,
+                    stmt.excluded.processed_until
+                )
+            }
+        )
+        await db.session.execute(stmt)
+        await db.session.commit()
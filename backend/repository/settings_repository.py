@@ -21,6 +21,14 @@ class SettingsRepository(CrudRepository[Settings, UUID]):
             return SettingsModelPydantic.from_orm(settings_data)
         return None
 
+    async def find_by_user_ids(self, user_ids: List[UUID]) -> List[SettingsModelPydantic]:
+        if not user_ids:
+            return []
+
+        stmt = select(Settings).where(Settings.user_id.in_(user_ids))
+        result = await db.session.execute(stmt)
+        return [SettingsModelPydantic.from_orm(s) for s in result.scalars().all()]
+
     async def find_users_with_current_reminder_time(self) -> List[SettingsModelPydantic]:
         list_settings = []
 
@@ -1,27 +1,107 @@
 from uuid import UUID
-from typing import Optional
+from datetime import datetime
+from typing import List
 
+from sqlalchemy import and_, func, union_all
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 
 from backend.database import db
-from backend.models.models import TimeSlotAlert
+from backend.models.models import TimeSlotAlert, TimeSlots, Settings, User
 from backend.repository.crud_repository import CrudRepository
-from backend.schemas.time_slot_alert_schema import TimeSlotAlertModelPydantic
+from backend.schemas.time_slot_alert_schema import DueTimeSlotAlert
 
 
 class TimeSlotAlertRepository(CrudRepository[TimeSlotAlert, UUID]):
-    async def find_by_user_id_and_time_slot_id(
+    async def find_due(
             self,
-            user_id: UUID,
-            time_slot_id: UUID
-    ) -> Optional[TimeSlotAlertModelPydantic]:
-        stmt = select(TimeSlotAlert).where(
-            TimeSlotAlert.user_id == user_id,
-            TimeSlotAlert.time_slot_id == time_slot_id
+            due_after: datetime,
+            due_until: datetime
+    ) -> List[DueTimeSlotAlert]:
+        """
+        Одним запросом находит пары (участник, слот), у которых момент напоминания
+        попал в окно (due_after, due_until] и которым оно ещё не отправлялось.
+        """
+        # Напоминание не может наступить позже due_until, поэтому встреча начинается
+        # не позже due_until плюс самый большой отступ среди пользователей. Условие
+        # по meet_start_at использует частичный индекс по подтверждённым слотам.
+        max_offset_minutes = select(
+            func.coalesce(func.max(Settings.alert_offset_minutes), 0)
+        ).scalar_subquery()
+        window_end = due_until + func.make_interval(0, 0, 0, 0, 0, max_offset_minutes)
+
+        # Каждый подтверждённый слот раскладывается на участников: владелец и приглашённый.
+        # Для слотов, забронированных на себя, приглашённый совпадает с владельцем
+        # и второй раз не добавляется.
+        participants = union_all(
+            select(
+                TimeSlots.id.label("time_slot_id"),
+                TimeSlots.owner_id.label("user_id"),
+                TimeSlots.invited_id.label("companion_id"),
+                TimeSlots.meet_start_at,
+                TimeSlots.meet_end_at,
+                TimeSlots.title,
+                TimeSlots.meeting_url
+            ).where(
+                TimeSlots.confirm == True,
+                TimeSlots.meet_start_at > due_until,
+                TimeSlots.meet_start_at <= window_end
+            ),
+            select(
+                TimeSlots.id.label("time_slot_id"),
+                TimeSlots.invited_id.label("user_id"),
+                TimeSlots.owner_id.label("companion_id"),
+                TimeSlots.meet_start_at,
+                TimeSlots.meet_end_at,
+                TimeSlots.title,
+                TimeSlots.meeting_url
+            ).where(
+                TimeSlots.confirm == True,
+                TimeSlots.meet_start_at > due_until,
+                TimeSlots.meet_start_at <= window_end,
+                TimeSlots.invited_id != TimeSlots.owner_id
+            )
+        ).subquery("participants")
+
+        recipient = aliased(User)
+        companion = aliased(User)
+
+        alert_at = participants.c.meet_start_at - func.make_interval(
+            0, 0, 0, 0, 0, Settings.alert_offset_minutes
         )
+
+        stmt = (
+            select(
+                participants.c.time_slot_id,
+                participants.c.user_id,
+                recipient.max_id.label("user_max_id"),
+                Settings.timezone.label("user_timezone"),
+                Settings.alert_offset_minutes,
+                companion.name.label("companion_name"),
+                participants.c.meet_start_at,
+                participants.c.meet_end_at,
+                participants.c.title,
+                participants.c.meeting_url
+            )
+            .join(Settings, Settings.user_id == participants.c.user_id)
+            .join(recipient, recipient.id == participants.c.user_id)
+            .join(companion, companion.id == participants.c.companion_id)
+            .outerjoin(
+                TimeSlotAlert,
+                and_(
+                    TimeSlotAlert.user_id == participants.c.user_id,
+                    TimeSlotAlert.time_slot_id == participants.c.time_slot_id
+                )
+            )
+            .where(
+                TimeSlotAlert.id.is_(None),
+                Settings.alert_offset_minutes.isnot(None),
+                alert_at > due_after,
+                alert_at <= due_until
+            )
+            .order_by(participants.c.meet_start_at.asc())
+        )
+
         result = await db.session.execute(stmt)
-        alert_data = result.scalar_one_or_none()
 
-        if alert_data:
-            return TimeSlotAlertModelPydantic.from_orm(alert_data)
-        return None
+        return [DueTimeSlotAlert.model_validate(row) for row in result.mappings().all()]
@@ -1,50 +1,80 @@
+from contextlib import asynccontextmanager
 from uuid import UUID
-from datetime import datetime, date
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from sqlalchemy import func, and_
+from sqlalchemy import and_, or_, update, union_all, Select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 
 from backend.database import db
+from backend.exceptions import TimeSlotOverlapError
 from backend.models.models import TimeSlots
 from backend.repository.crud_repository import CrudRepository
 from backend.schemas.time_slots_schema import TimeSlotsModelPydantic
 
 
-class TimeSlotsRepository(CrudRepository[TimeSlots, UUID]):
-    async def find_by_user_id_an_date(
-            self,
-            user_id: UUID,
-            target_date: date
-    ) -> List[TimeSlotsModelPydantic]:
-        slot_list = []
+# SQLSTATE exclusion_violation: сработало ограничение time_slot_participant_no_overlap
+EXCLUSION_VIOLATION = "23P01"
+
 
-        stmt = select(TimeSlots).where(
-            TimeSlots.owner_id == user_id,
+class TimeSlotsRepository(CrudRepository[TimeSlots, UUID]):
+    @asynccontextmanager
+    async def _overlap_guard(self):
+        try:
+            yield
+        except IntegrityError as e:
+            await db.session.rollback()
+            if getattr(e.orig, "sqlstate", None) == EXCLUSION_VIOLATION:
+                raise TimeSlotOverlapError from e
+            raise
+
+    async def save(self, entity: TimeSlots) -> TimeSlots:
+        # Вставка подтверждённого слота проверяется на пересечения одним INSERT
+        async with self._overlap_guard():
+            return await super().save(entity)
+
+    async def update(self, entity_id: UUID, data: dict) -> Optional[TimeSlots]:
+        async with self._overlap_guard():
+            return await super().update(entity_id, data)
+
+    def _user_slots_stmt(self, user_ids: List[UUID], *criteria) -> Select:
+        """
+        Подтверждённые слоты пользователей в обеих ролях одним запросом.
+        Слот, владелец которого сам входит в user_ids (в том числе забронированный
+        на себя), попадает только в ветку владельца, поэтому UNION ALL не даёт
+        дублей. Каждая ветка использует свой составной индекс
+        (owner_id/invited_id, meet_start_at, meet_end_at).
+        """
+        where_owner = select(TimeSlots).where(
+            TimeSlots.owner_id.in_(user_ids),
             TimeSlots.confirm == True,
-            func.date(TimeSlots.meet_start_at) == target_date
+            *criteria
+        )
+        where_invited = select(TimeSlots).where(
+            TimeSlots.invited_id.in_(user_ids),
+            TimeSlots.owner_id.not_in(user_ids),
+            TimeSlots.confirm == True,
+            *criteria
         )
-        result = await db.session.execute(stmt)
-        time_slots = result.scalars().all()
-
-        for time_slot in time_slots:
-            slot_list.append(
-                TimeSlotsModelPydantic.from_orm(time_slot)
-            )
 
-        return slot_list
+        user_slots = aliased(TimeSlots, union_all(where_owner, where_invited).subquery("user_slots"))
+        return select(user_slots).order_by(user_slots.meet_start_at.asc())
 
-    async def find_user_invited_by_user_id_an_date(
+    async def find_by_user_ids_and_range(
             self,
-            user_id: UUID,
-            target_date: date
+            user_ids: List[UUID],
+            start_at: datetime,
+            end_at: datetime
     ) -> List[TimeSlotsModelPydantic]:
         slot_list = []
 
-        stmt = select(TimeSlots).where(
-            TimeSlots.invited_id == user_id,
-            TimeSlots.confirm == True,
-            func.date(TimeSlots.meet_start_at) == target_date
+        # Полуинтервал [start_at, end_at) по meet_start_at
+        stmt = self._user_slots_stmt(
+            user_ids,
+            TimeSlots.meet_start_at >= start_at,
+            TimeSlots.meet_start_at < end_at
         )
         result = await db.session.execute(stmt)
         time_slots = result.scalars().all()
@@ -56,24 +86,20 @@ class TimeSlotsRepository(CrudRepository[TimeSlots, UUID]):
 
         return slot_list
 
-    async def find_overlapping_slots_for_owner(
-        self,
-        user_id: UUID,
-        meet_start_at_target: datetime,
-        meet_end_at_target: datetime
+    async def find_overlapping_by_user_ids(
+            self,
+            user_ids: List[UUID],
+            start_at: datetime,
+            end_at: datetime
     ) -> List[TimeSlotsModelPydantic]:
         slot_list = []
 
-        stmt = (
-            select(TimeSlots)
-            .where(
-                TimeSlots.owner_id == user_id,
-                TimeSlots.confirm == True,
-                # Проверка пересечения интервалов:
-                and_(
-                    TimeSlots.meet_start_at < meet_end_at_target,
-                    TimeSlots.meet_end_at > meet_start_at_target
-                )
+        stmt = self._user_slots_stmt(
+            user_ids,
+            # Проверка пересечения интервалов:
+            and_(
+                TimeSlots.meet_start_at < end_at,
+                TimeSlots.meet_end_at > start_at
             )
         )
 
@@ -85,54 +111,74 @@ class TimeSlotsRepository(CrudRepository[TimeSlots, UUID]):
 
         return slot_list
 
-    async def find_overlapping_slots_for_invited(
-            self,
-            user_id: UUID,
-            meet_start_at_target: datetime,
-            meet_end_at_target: datetime
-    ) -> List[TimeSlotsModelPydantic]:
-        slot_list = []
+    def _missing_meeting_url_criteria(self, stale_before: datetime) -> list:
+        # Ссылки создаются только для встреч с приглашённым, не для брони на себя
+        return [
+            TimeSlots.confirm == True,
+            TimeSlots.meeting_url.is_(None),
+            TimeSlots.invited_id != TimeSlots.owner_id,
+            or_(
+                TimeSlots.meeting_provision_claimed_at.is_(None),
+                TimeSlots.meeting_provision_claimed_at < stale_before
+            )
+        ]
 
+    async def find_missing_meeting_url_ids(
+            self,
+            current_time: datetime,
+            stale_before: datetime,
+            limit: int
+    ) -> List[UUID]:
         stmt = (
-            select(TimeSlots)
+            select(TimeSlots.id)
             .where(
-                TimeSlots.invited_id == user_id,
-                TimeSlots.confirm == True,
-                # Проверка пересечения интервалов:
-                and_(
-                    TimeSlots.meet_start_at < meet_end_at_target,
-                    TimeSlots.meet_end_at > meet_start_at_target
-                )
+                TimeSlots.meet_end_at > current_time,
+                *self._missing_meeting_url_criteria(stale_before)
             )
+            .order_by(TimeSlots.meet_start_at.asc())
+            .limit(limit)
         )
-
         result = await db.session.execute(stmt)
-        overlapping_slots = result.scalars().all()
-
-        for slot in overlapping_slots:
-            slot_list.append(TimeSlotsModelPydantic.from_orm(slot))
-
-        return slot_list
+        return list(result.scalars().all())
 
-    async def find_upcoming(
+    async def claim_meeting_provision(
             self,
-            current_time: datetime
-    ) -> List[TimeSlotsModelPydantic]:
-        slot_list = []
-
+            time_slot_id: UUID,
+            claimed_at: datetime,
+            stale_before: datetime
+    ) -> bool:
+        """
+        Заявляет создание ссылки одним UPDATE: из параллельных воркеров и
+        повторных подтверждений успешен только первый, пока не истекла аренда.
+        """
         stmt = (
-            select(TimeSlots)
+            update(TimeSlots)
             .where(
-                TimeSlots.confirm == True,
-                TimeSlots.meet_end_at > current_time
+                TimeSlots.id == time_slot_id,
+                *self._missing_meeting_url_criteria(stale_before)
             )
-            .order_by(TimeSlots.meet_start_at.asc())
+            .values(meeting_provision_claimed_at=claimed_at)
+            .returning(TimeSlots.id)
         )
-
         result = await db.session.execute(stmt)
-        time_slots = result.scalars().all()
-
-        for time_slot in time_slots:
-            slot_list.append(TimeSlotsModelPydantic.from_orm(time_slot))
+        claimed = result.scalar_one_or_none() is not None
+        await db.session.commit()
+        return claimed
 
-        return slot_list
+    async def set_meeting_url_if_confirmed(
+            self,
+            time_slot_id: UUID,
+            meeting_url: str
+    ) -> Optional[TimeSlots]:
+        """ Записывает ссылку, только если слот всё ещё подтверждён. """
+        stmt = (
+            update(TimeSlots)
+            .where(TimeSlots.id == time_slot_id, TimeSlots.confirm == True)
+            .values(meeting_url=meeting_url, meeting_provision_claimed_at=None)
+            .returning(TimeSlots)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.session.execute(stmt)
+        time_slot = result.scalar_one_or_none()
+        await db.session.commit()
+        return time_slot
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class CacheStatsResponse(BaseModel):
+    settings: CacheStats
+    share_tokens: CacheStats
+    busy_bitmaps: CacheStats
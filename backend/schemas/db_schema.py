@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    mode: str
+    size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    saturation: Optional[float] = None  # доля занятых соединений от size + max_overflow
+    checkouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    timeouts: int
@@ -1,8 +1,12 @@
 from uuid import UUID
+from typing import Optional
 from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict
 
+from backend.schemas.user_schema import UserModelPydantic
+from backend.schemas.settings_schema import SettingsModelPydantic
+
 
 class ShareModelPydantic(BaseModel):
     id: UUID
@@ -15,3 +19,8 @@ class ShareModelPydantic(BaseModel):
 
 class ShareTokenResponse(BaseModel):
     token: str
+
+
+class SharedCalendarOwner(BaseModel):
+    owner: UserModelPydantic
+    owner_settings: Optional[SettingsModelPydantic] = None
@@ -1,4 +1,5 @@
 from uuid import UUID
+from typing import Optional
 from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict
@@ -11,3 +12,18 @@ class TimeSlotAlertModelPydantic(BaseModel):
     sent_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DueTimeSlotAlert(BaseModel):
+    time_slot_id: UUID
+    user_id: UUID
+    user_max_id: int
+    user_timezone: int
+    alert_offset_minutes: int
+    companion_name: Optional[str] = None
+    meet_start_at: datetime
+    meet_end_at: datetime
+    title: str
+    meeting_url: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
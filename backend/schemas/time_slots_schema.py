@@ -47,10 +47,28 @@ class SelfTimeSlotsGetResponse(BaseModel):
     time_slots: List[GetSelfTimeSlot]
 
 
+class SelfDayTimeSlots(BaseModel):
+    date: date
+    time_slots: List[GetSelfTimeSlot]
+
+
+class SelfTimeSlotsRangeGetResponse(BaseModel):
+    days: List[SelfDayTimeSlots]
+
+
 class ExternalTimeSlotsGetResponse(BaseModel):
     time_slots: List[GetExternalTimeSlot]
 
 
+class ExternalDayTimeSlots(BaseModel):
+    date: date
+    time_slots: List[GetExternalTimeSlot]
+
+
+class ExternalTimeSlotsRangeGetResponse(BaseModel):
+    days: List[ExternalDayTimeSlots]
+
+
 class TimeSlotsModelPydantic(BaseModel):
     id: UUID
     owner_id: UUID
@@ -0,0 +1,162 @@
+from uuid import UUID
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Tuple
+
+from backend.cache import TTLCache, MISSING
+from backend.intervals import MINUTES_PER_DAY, minutes_since, interval_mask
+from backend.repository.time_slots_repository import TimeSlotsRepository
+from backend.schemas.cache_schema import CacheStats
+from backend.schemas.time_slots_schema import TimeSlotsModelPydantic
+from backend.settings.settings import settings
+
+
+class BusyBitmapService:
+    """
+    Занятость пользователей по минутам UTC-суток: бит i маски - минута i.
+
+    Маски строятся лениво из подтверждённых слотов и дополняются при
+    создании и подтверждении слотов, а при отмене сбрасываются и
+    перечитываются при следующем обращении. Маски ускоряют выдачу
+    свободных слотов, а пересечения при бронировании проверяет БД.
+    """
+
+    def __init__(self, time_slots_repository: TimeSlotsRepository):
+        self._time_slots_repository = time_slots_repository
+        self._masks: TTLCache[Tuple[UUID, date], int] = TTLCache(
+            max_size=settings.busy_bitmap_cache_max_size,
+            ttl=settings.busy_bitmap_cache_ttl_seconds
+        )
+        # Растёт при каждом изменении занятости. Маски, прочитанные из БД до
+        # изменения, в кэш не попадают, чтобы не затереть более свежие данные
+        self._generation = 0
+
+    @staticmethod
+    def _day_start(day: date) -> datetime:
+        return datetime.combine(day, datetime.min.time())
+
+    @staticmethod
+    def _days(start_at: datetime, end_at: datetime) -> List[date]:
+        """ UTC-сутки, которые задевает полуинтервал [start_at, end_at). """
+        first_day = start_at.date()
+        last_day = (end_at - timedelta(microseconds=1)).date()
+        return [first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)]
+
+    @classmethod
+    def _slot_day_mask(cls, slot: TimeSlotsModelPydantic, day: date) -> int:
+        day_start_at = cls._day_start(day)
+        start_min = minutes_since(slot.meet_start_at, day_start_at)
+        # Неполная последняя минута считается занятой
+        end_min = -minutes_since(day_start_at, slot.meet_end_at)
+        return interval_mask(start_min, end_min, MINUTES_PER_DAY)
+
+    async def _load_day_masks(self, keys: List[Tuple[UUID, date]]) -> Dict[Tuple[UUID, date], int]:
+        generation = self._generation
+
+        # Один запрос на всех пользователей и весь диапазон недостающих суток
+        days = sorted({day for _, day in keys})
+        start_at = self._day_start(days[0])
+        end_at = self._day_start(days[-1]) + timedelta(days=1)
+
+        slots = await self._time_slots_repository.find_overlapping_by_user_ids(
+            user_ids=list({user_id for user_id, _ in keys}),
+            start_at=start_at,
+            end_at=end_at
+        )
+
+        masks = dict.fromkeys(keys, 0)
+        for slot in slots:
+            if slot.meet_end_at <= slot.meet_start_at:
+                continue
+
+            for day in self._days(max(slot.meet_start_at, start_at), min(slot.meet_end_at, end_at)):
+                slot_mask = self._slot_day_mask(slot, day)
+                for user_id in {slot.owner_id, slot.invited_id}:
+                    key = (user_id, day)
+                    if key in masks:
+                        masks[key] |= slot_mask
+
+        if generation == self._generation:
+            for key, mask in masks.items():
+                self._masks.set(key, mask)
+
+        return masks
+
+    async def get_busy_masks(
+            self,
+            user_ids: List[UUID],
+            start_at: datetime,
+            end_at: datetime
+    ) -> Dict[UUID, int]:
+        """ Маски занятости за [start_at, end_at): бит i - минута start_at + i. """
+        user_ids = list(dict.fromkeys(user_ids))
+        if end_at <= start_at:
+            # Пустой или перевёрнутый диапазон ни с чем не пересекается
+            return dict.fromkeys(user_ids, 0)
+
+        days = self._days(start_at, end_at)
+
+        day_masks = {}
+        missing = []
+        for user_id in user_ids:
+            for day in days:
+                mask = self._masks.get((user_id, day))
+                if mask is MISSING:
+                    missing.append((user_id, day))
+                else:
+                    day_masks[(user_id, day)] = mask
+
+        if missing:
+            day_masks.update(await self._load_day_masks(missing))
+
+        shift = minutes_since(start_at, self._day_start(days[0]))
+        length_mask = (1 << -minutes_since(start_at, end_at)) - 1
+
+        result = {}
+        for user_id in user_ids:
+            mask = 0
+            for day_index, day in enumerate(days):
+                mask |= day_masks[(user_id, day)] << (day_index * MINUTES_PER_DAY)
+            result[user_id] = (mask >> shift) & length_mask
+
+        return result
+
+    def _participant_days(self, slot: TimeSlotsModelPydantic) -> List[Tuple[UUID, date]]:
+        if slot.meet_end_at <= slot.meet_start_at:
+            return []
+
+        return [
+            (user_id, day)
+            for day in self._days(slot.meet_start_at, slot.meet_end_at)
+            for user_id in {slot.owner_id, slot.invited_id}
+        ]
+
+    def mark_busy(self, slot: TimeSlotsModelPydantic) -> None:
+        self._generation += 1
+
+        for user_id, day in self._participant_days(slot):
+            # Отсутствующие маски не создаём: их построит ленивое чтение из БД
+            mask = self._masks.get((user_id, day))
+            if mask is not MISSING:
+                self._masks.set((user_id, day), mask | self._slot_day_mask(slot, day))
+
+    def invalidate(self, slot: TimeSlotsModelPydantic) -> None:
+        # Снять биты нельзя: маски округлены до минут, и соседний слот может
+        # занимать ту же минуту, поэтому сутки перечитываются из БД
+        self.invalidate_range(
+            user_ids=[slot.owner_id, slot.invited_id],
+            start_at=slot.meet_start_at,
+            end_at=slot.meet_end_at
+        )
+
+    def invalidate_range(self, user_ids: List[UUID], start_at: datetime, end_at: datetime) -> None:
+        self._generation += 1
+
+        if end_at <= start_at:
+            return
+
+        for day in self._days(start_at, end_at):
+            for user_id in user_ids:
+                self._masks.invalidate((user_id, day))
+
+    def get_cache_stats(self) -> CacheStats:
+        return self._masks.stats()
@@ -1,10 +1,10 @@
 from uuid import UUID
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Tuple, Set
 
 from backend.models.models import DailyAlert
 from backend.repository.daily_alert_repository import DailyAlertRepository
-from backend.schemas.time_slot_alert_schema import TimeSlotAlertModelPydantic
+from backend.schemas.time_slot_alert_schema import DueTimeSlotAlert
 
 
 class DailyAlertService:
@@ -14,24 +14,24 @@ class DailyAlertService:
     ):
         self._daily_alert_repository = daily_alert_repository
 
-    async def create_alert(self, user_id: UUID, time_slot_id: UUID) -> TimeSlotAlertModelPydantic:
-        alert_data = await self._daily_alert_repository.save(
-            entity=DailyAlert(
-                user_id=user_id,
-                time_slot_id=time_slot_id,
-                sent_at=datetime.now(timezone.utc).replace(tzinfo=None)
-            )
+    async def get_due_alerts(self, user_ids: List[UUID]) -> List[DueTimeSlotAlert]:
+        return await self._daily_alert_repository.find_due_for_users(
+            user_ids=user_ids,
+            current_time=datetime.now(timezone.utc).replace(tzinfo=None)
         )
 
-        return TimeSlotAlertModelPydantic.from_orm(alert_data)
-
-    async def get_by_user_id_and_time_slot_id(
-            self,
-            user_id: UUID,
-            time_slot_id: UUID
-    ) -> Optional[TimeSlotAlertModelPydantic]:
-        alerts = await self._daily_alert_repository.find_by_user_id_and_time_slot_id(
-            user_id=user_id,
-            time_slot_id=time_slot_id
+    async def claim_alerts(self, alerts: List[Tuple[UUID, UUID]]) -> Set[Tuple[UUID, UUID]]:
+        """
+        Записывает напоминания до отправки одним INSERT ... ON CONFLICT DO NOTHING.
+        Возвращает только новые пары (user_id, time_slot_id): уже записанные
+        другим запуском повторно не отправляются.
+        """
+        sent_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        claimed = await self._daily_alert_repository.upsert_many(
+            entities=[
+                DailyAlert(user_id=user_id, time_slot_id=time_slot_id, sent_at=sent_at)
+                for user_id, time_slot_id in alerts
+            ],
+            constraint="daily_alert_unique"
         )
-        return alerts
+        return {(alert.user_id, alert.time_slot_id) for alert in claimed}
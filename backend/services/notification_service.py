@@ -6,6 +6,7 @@ from maxapi import Bot
 from maxapi.types import ButtonsPayload, CallbackButton
 from maxapi.filters.callback_payload import CallbackPayload
 
+from backend.metrics import track_call
 from backend.settings.settings import Settings
 from backend.schemas.notification_schema import (
     Notification,
@@ -16,6 +17,7 @@ from backend.schemas.notification_schema import (
 )
 from backend.signals import (
     confirm_time_slot_signal,
+    meeting_link_signal,
     new_slot_signal,
     alert_before_meet_signal,
     self_booking_signal,
@@ -33,27 +35,37 @@ class NotificationService:
         self._bot = Bot(settings.max_api_key)
         new_slot_signal.connect(self._handle_new_slot)
         confirm_time_slot_signal.connect(self._handle_confirm_time_slot)
+        meeting_link_signal.connect(self._handle_meeting_link)
         alert_before_meet_signal.connect(self._handle_alert_meet)
         self_booking_signal.connect(self._handel_self_booking)
         daily_reminder_signal.connect(self._handel_daily_reminder)
 
+    async def _send_message(self, operation: str, **kwargs):
+        with track_call(service="max_bot", operation=operation):
+            return await self._bot.send_message(**kwargs)
+
     def from_utc_naive(self, dt_utc: datetime, tz_offset_hours: int) -> datetime:
         dt_utc = dt_utc.replace(tzinfo=timezone.utc)
         local_time = dt_utc.astimezone(timezone(timedelta(hours=tz_offset_hours)))
         return local_time.replace(tzinfo=None)
 
+    # Напоминания отправляются из cron-тика: ждём отправку, чтобы её ошибка
+    # дошла до вызывающего кода, а не потерялась в фоновой задаче
     async def _handel_daily_reminder(self, notification_data: DailyReminderNotification):
-        asyncio.create_task(self.send_daily_reminder_notification(notification_data=notification_data))
+        await self.send_daily_reminder_notification(notification_data=notification_data)
 
     async def _handel_self_booking(self, notification_data: SelfBookingNotification):
         asyncio.create_task(self.self_booking_notification(notification_data=notification_data))
 
     async def _handle_alert_meet(self, notification_data: MeetAlertNotification):
-        asyncio.create_task(self.send_alert_meet(notification_data=notification_data))
+        await self.send_alert_meet(notification_data=notification_data)
 
     async def _handle_confirm_time_slot(self, notification_data: ConfirmTimeSlotNotification):
         asyncio.create_task(self.send_notification_confirm_slot(notification_data=notification_data))
 
+    async def _handle_meeting_link(self, notification_data: ConfirmTimeSlotNotification):
+        asyncio.create_task(self.send_meeting_link(notification_data=notification_data))
+
     async def _handle_new_slot(self, notification_data: Notification):
         asyncio.create_task(self.send_notification_new_slot(notification_data=notification_data))
 
@@ -99,7 +111,8 @@ class NotificationService:
 
         payload = ButtonsPayload(buttons=buttons).pack()
 
-        await self._bot.send_message(
+        await self._send_message(
+            operation="new_slot",
             user_id=notification_data.owner_user_max_id,
             text=message,
             attachments=[payload]
@@ -142,7 +155,7 @@ class NotificationService:
         return f"""{emoji} Пользователь {notification_data.owner_user_user_name} {confirm_text} с вами встречу
 Название: {notification_data.title}
 Время: с {invited_meet_start_at} по {invited_meet_end_at}
-Ссылка на встречу: {notification_data.meeting_url}
+Ссылка на встречу: {self.meeting_url_text(notification_data)}
         """
 
     def message_owner_builder_confirm_slot(self, notification_data: ConfirmTimeSlotNotification):
@@ -169,7 +182,7 @@ class NotificationService:
         return f"""{emoji} Вы успешно {confirm_text} встречу с {notification_data.invite_use_name}
 Название: {notification_data.title}
 Время: с {owner_meet_start_at} по {owner_meet_end_at}
-Ссылка на встречу: {notification_data.meeting_url}
+Ссылка на встречу: {self.meeting_url_text(notification_data)}
 """
 
     async def send_notification_confirm_slot(self, notification_data: ConfirmTimeSlotNotification):
@@ -180,17 +193,59 @@ class NotificationService:
             notification_data=notification_data
         )
 
-        await self._bot.send_message(
+        await self._send_message(
+            operation="confirm_slot",
             user_id=notification_data.invite_user_max_id,
             text=message_invited
         )
 
         if notification_data.owner_user_max_id != notification_data.invite_user_max_id:
-            await self._bot.send_message(
+            await self._send_message(
+                operation="confirm_slot",
                 user_id=notification_data.owner_user_max_id,
                 text=message_owner
             )
 
+    @staticmethod
+    def meeting_url_text(notification_data: ConfirmTimeSlotNotification) -> str:
+        if notification_data.meeting_url:
+            return notification_data.meeting_url
+        # Ссылка создаётся в фоне после подтверждения
+        return "пришлём отдельным сообщением" if notification_data.confirm else "отсутствует"
+
+    def message_builder_meeting_link(self, notification_data: ConfirmTimeSlotNotification, tz_offset_hours: int) -> str:
+        meet_start_at = self.from_utc_naive(
+            dt_utc=notification_data.meet_start_at,
+            tz_offset_hours=tz_offset_hours
+        )
+        meet_start_at = meet_start_at.strftime("%d.%m.%Y %H:%M")
+
+        return f"""🔗 Ссылка на встречу готова
+Название: {notification_data.title}
+Начало в: {meet_start_at}
+Ссылка на встречу: {notification_data.meeting_url}
+"""
+
+    async def send_meeting_link(self, notification_data: ConfirmTimeSlotNotification):
+        await self._send_message(
+            operation="meeting_link",
+            user_id=notification_data.invite_user_max_id,
+            text=self.message_builder_meeting_link(
+                notification_data=notification_data,
+                tz_offset_hours=notification_data.invite_timezone
+            )
+        )
+
+        if notification_data.owner_user_max_id != notification_data.invite_user_max_id:
+            await self._send_message(
+                operation="meeting_link",
+                user_id=notification_data.owner_user_max_id,
+                text=self.message_builder_meeting_link(
+                    notification_data=notification_data,
+                    tz_offset_hours=notification_data.owner_timezone
+                )
+            )
+
     def alert_meet_message_builder(self, notification_data: MeetAlertNotification) -> str:
         meet_start_at = self.from_utc_naive(
             dt_utc=notification_data.meet_start_at,
@@ -215,7 +270,8 @@ class NotificationService:
 
     async def send_alert_meet(self, notification_data: MeetAlertNotification):
         message = self.alert_meet_message_builder(notification_data=notification_data)
-        await self._bot.send_message(
+        await self._send_message(
+            operation="alert_meet",
             user_id=notification_data.user_max_id,
             text=message
         )
@@ -241,7 +297,8 @@ class NotificationService:
 
     async def self_booking_notification(self, notification_data: SelfBookingNotification):
         message = self.self_booking_message_builder(notification_data=notification_data)
-        await self._bot.send_message(
+        await self._send_message(
+            operation="self_booking",
             user_id=notification_data.user_max_id,
             text=message
         )
@@ -279,7 +336,8 @@ class NotificationService:
     async def send_daily_reminder_notification(self, notification_data: DailyReminderNotification):
         message = self.daily_reminder_message_builder(notification_data=notification_data)
         max_id = notification_data.slot_list[0].user_max_id
-        await self._bot.send_message(
+        await self._send_message(
+            operation="daily_reminder",
             user_id=max_id,
             text=message
         )
@@ -1,18 +1,28 @@
 import asyncio
 from datetime import datetime
 from uuid import UUID
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Dict
 
 from backend.models.models import Settings
 from backend.repository.settings_repository import SettingsRepository
 from backend.schemas.settings_schema import SettingsModelPydantic, SettingsResponse
 from backend.signals import user_register_signal
 from backend.decorators import background_session
+from backend.loader import RequestLoader
+from backend.cache import TTLCache, MISSING
+from backend.schemas.cache_schema import CacheStats
+from backend.settings.settings import settings as app_settings
 
 
 class SettingsService:
     def __init__(self, settings_repository: SettingsRepository):
         self._settings_repository = settings_repository
+        self._loader = RequestLoader(name="settings", batch_load=self._load_settings)
+        # Настройки читаются почти в каждом запросе, а меняются только через этот сервис
+        self._cache: TTLCache[UUID, SettingsModelPydantic] = TTLCache(
+            max_size=app_settings.settings_cache_max_size,
+            ttl=app_settings.settings_cache_ttl_seconds
+        )
         user_register_signal.connect(self._handle_user_created_wrapper)
 
     async def _handle_user_created_wrapper(self, user_id: UUID):
@@ -122,7 +132,11 @@ class SettingsService:
         settings_data = await self._settings_repository.save(
             entity=settings
         )
-        return SettingsModelPydantic.from_orm(settings_data)
+
+        settings_model = SettingsModelPydantic.from_orm(settings_data)
+        self._cache.set(user_id, settings_model)
+        self._loader.prime(user_id, settings_model)
+        return settings_model
 
     async def update_settings(self, user_id: UUID, update_data: dict[str, Any]) -> SettingsModelPydantic:
         settings = await self.get_settings(user_id=user_id)
@@ -131,11 +145,36 @@ class SettingsService:
             data=update_data
         )
         s = SettingsModelPydantic.from_orm(updated_settings)
+        self._cache.set(user_id, s)
+        self._loader.prime(user_id, s)
         return s
 
+    async def _load_settings(self, user_ids: List[UUID]) -> Dict[UUID, SettingsModelPydantic]:
+        loaded = {}
+        missed = []
+        for user_id in user_ids:
+            cached = self._cache.get(user_id)
+            if cached is MISSING:
+                missed.append(user_id)
+            else:
+                loaded[user_id] = cached
+
+        if missed:
+            settings_list = await self._settings_repository.find_by_user_ids(user_ids=missed)
+            for settings in settings_list:
+                self._cache.set(settings.user_id, settings)
+                loaded[settings.user_id] = settings
+
+        return loaded
+
+    def get_cache_stats(self) -> CacheStats:
+        return self._cache.stats()
+
     async def get_settings(self, user_id: UUID) -> SettingsModelPydantic:
-        settings = await self._settings_repository.find_by_user_id(user_id=user_id)
-        return settings
+        return await self._loader.load(user_id)
+
+    async def get_settings_many(self, user_ids: List[UUID]) -> List[Optional[SettingsModelPydantic]]:
+        return await self._loader.load_many(user_ids)
 
     async def get_users_with_current_reminder_time(self) -> List[SettingsModelPydantic]:
         return await self._settings_repository.find_users_with_current_reminder_time()
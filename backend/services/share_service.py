@@ -3,14 +3,33 @@ import string
 from uuid import UUID
 from typing import Optional
 
+from backend.cache import TTLCache, MISSING
 from backend.models.models import Share
 from backend.repository.share_repository import ShareRepository
-from backend.schemas.share_schema import ShareModelPydantic
+from backend.schemas.cache_schema import CacheStats
+from backend.schemas.share_schema import ShareModelPydantic, SharedCalendarOwner
+from backend.schemas.user_schema import UserModelPydantic
+from backend.services.user_service import UserService
+from backend.services.settings_service import SettingsService
+from backend.settings.settings import settings
 
 
 class ShareService:
-    def __init__(self, share_repository: ShareRepository):
+    def __init__(
+            self,
+            share_repository: ShareRepository,
+            user_service: UserService,
+            settings_service: SettingsService
+    ):
         self._share_repository = share_repository
+        self._user_service = user_service
+        self._settings_service = settings_service
+        # token -> владелец календаря; None запоминается для неизвестных токенов,
+        # чтобы перебор ссылок не доходил до Postgres
+        self._token_cache: TTLCache[str, Optional[UserModelPydantic]] = TTLCache(
+            max_size=settings.share_token_cache_max_size,
+            ttl=settings.share_token_cache_ttl_seconds
+        )
 
     @staticmethod
     def create_token():
@@ -44,3 +63,30 @@ class ShareService:
     async def get_share_data_by_token(self, token: str) -> Optional[ShareModelPydantic]:
         share_data = await self._share_repository.find_by_token(token=token)
         return share_data
+
+    async def _get_owner_by_token(self, token: str) -> Optional[UserModelPydantic]:
+        owner = self._token_cache.get(token)
+        if owner is not MISSING:
+            return owner
+
+        share_data = await self.get_share_data_by_token(token=token)
+        if share_data is None:
+            self._token_cache.set(token, None, ttl=settings.share_token_negative_ttl_seconds)
+            return None
+
+        owner = await self._user_service.get_by_user_id(user_id=share_data.owner_id)
+        self._token_cache.set(token, owner)
+        return owner
+
+    async def resolve_owner(self, token: str) -> Optional[SharedCalendarOwner]:
+        owner = await self._get_owner_by_token(token=token)
+        if owner is None:
+            return None
+
+        # Настройки берутся из кэша SettingsService, который обновляется при записи,
+        # поэтому снимок владельца не переживает изменение его настроек
+        owner_settings = await self._settings_service.get_settings(user_id=owner.id)
+        return SharedCalendarOwner(owner=owner, owner_settings=owner_settings)
+
+    def get_cache_stats(self) -> CacheStats:
+        return self._token_cache.stats()
@@ -1,37 +1,55 @@
 from uuid import UUID
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, timezone, timedelta
+from typing import List, Tuple, Set
 
 from backend.models.models import TimeSlotAlert
 from backend.repository.time_slot_alert_repository import TimeSlotAlertRepository
-from backend.schemas.time_slot_alert_schema import TimeSlotAlertModelPydantic
+from backend.repository.reminder_watermark_repository import ReminderWatermarkRepository
+from backend.settings.settings import settings
+from backend.schemas.time_slot_alert_schema import DueTimeSlotAlert
 
 
 class TimeSlotAlertService:
+    WATERMARK_NAME = "time_slot_alert"
+
     def __init__(
             self,
-            time_slot_alert_repository: TimeSlotAlertRepository
+            time_slot_alert_repository: TimeSlotAlertRepository,
+            reminder_watermark_repository: ReminderWatermarkRepository
     ):
         self._time_slot_alert_repository = time_slot_alert_repository
+        self._reminder_watermark_repository = reminder_watermark_repository
 
-    async def create_alert(self, user_id: UUID, time_slot_id: UUID) -> TimeSlotAlertModelPydantic:
-        alert_data = await self._time_slot_alert_repository.save(
-            entity=TimeSlotAlert(
-                user_id=user_id,
-                time_slot_id=time_slot_id,
-                sent_at=datetime.now(timezone.utc).replace(tzinfo=None)
-            )
+    async def get_due_alerts(self, current_time: datetime) -> List[DueTimeSlotAlert]:
+        processed_until = await self._reminder_watermark_repository.find_processed_until(
+            name=self.WATERMARK_NAME
         )
+        if processed_until is None:
+            processed_until = current_time - timedelta(minutes=settings.reminder_tick_minutes)
 
-        return TimeSlotAlertModelPydantic.from_orm(alert_data)
+        return await self._time_slot_alert_repository.find_due(
+            due_after=processed_until,
+            due_until=current_time
+        )
 
-    async def get_by_user_id_and_time_slot_id(
-            self,
-            user_id: UUID,
-            time_slot_id: UUID
-    ) -> Optional[TimeSlotAlertModelPydantic]:
-        alerts = await self._time_slot_alert_repository.find_by_user_id_and_time_slot_id(
-            user_id=user_id,
-            time_slot_id=time_slot_id
+    async def mark_processed(self, processed_until: datetime) -> None:
+        await self._reminder_watermark_repository.advance(
+            name=self.WATERMARK_NAME,
+            processed_until=processed_until
+        )
+
+    async def claim_alerts(self, alerts: List[Tuple[UUID, UUID]]) -> Set[Tuple[UUID, UUID]]:
+        """
+        Записывает напоминания до отправки одним INSERT ... ON CONFLICT DO NOTHING.
+        Возвращает только новые пары (user_id, time_slot_id): уже записанные
+        другим запуском повторно не отправляются.
+        """
+        sent_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        claimed = await self._time_slot_alert_repository.upsert_many(
+            entities=[
+                TimeSlotAlert(user_id=user_id, time_slot_id=time_slot_id, sent_at=sent_at)
+                for user_id, time_slot_id in alerts
+            ],
+            constraint="time_slot_alert_unique"
         )
-        return alerts
+        return {(alert.user_id, alert.time_slot_id) for alert in claimed}
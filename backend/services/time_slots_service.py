@@ -1,10 +1,11 @@
 from uuid import UUID
-from datetime import datetime, date, timezone
-from typing import Optional, List, Any
+from datetime import datetime, date, timedelta, timezone
+from typing import Optional, List, Any, Tuple
 
 from backend.repository.time_slots_repository import TimeSlotsRepository
 from backend.schemas.time_slots_schema import TimeSlotsModelPydantic
 from backend.models.models import TimeSlots
+from backend.settings.settings import settings
 
 
 class TimeSlotsService:
@@ -48,18 +49,26 @@ class TimeSlotsService:
 
         return TimeSlotsModelPydantic.from_orm(updated_time_slot)
 
-    async def get_time_self_slots(
+    @staticmethod
+    def local_day_bounds(target_date: date, tz_offset_hours: int) -> Tuple[datetime, datetime]:
+        """ Границы локальных суток пользователя в UTC (naive) в виде полуинтервала. """
+        start_at = datetime.combine(target_date, datetime.min.time()) - timedelta(hours=tz_offset_hours)
+        return start_at, start_at + timedelta(days=1)
+
+    async def get_users_slots_in_range(
             self,
-            user_id: UUID,
-            target_date: date
+            user_ids: List[UUID],
+            start_date: date,
+            end_date: date,
+            tz_offset_hours: int = 0
     ) -> List[TimeSlotsModelPydantic]:
-        time_slots_where_owner = await self._time_slots_repository.find_by_user_id_an_date(
-            user_id=user_id, target_date=target_date
-        )
-        time_slots_where_invited = await self._time_slots_repository.find_user_invited_by_user_id_an_date(
-            user_id=user_id, target_date=target_date
+        """ Слоты нескольких пользователей за локальные дни start_date..end_date включительно. """
+        start_at, _ = self.local_day_bounds(target_date=start_date, tz_offset_hours=tz_offset_hours)
+        _, end_at = self.local_day_bounds(target_date=end_date, tz_offset_hours=tz_offset_hours)
+
+        return await self._time_slots_repository.find_by_user_ids_and_range(
+            user_ids=user_ids, start_at=start_at, end_at=end_at
         )
-        return time_slots_where_owner + time_slots_where_invited
 
     async def get_time_slot(self, time_slot_id: UUID) -> Optional[TimeSlotsModelPydantic]:
         time_slot = await self._time_slots_repository.find_by_id(
@@ -70,26 +79,33 @@ class TimeSlotsService:
             return TimeSlotsModelPydantic.from_orm(time_slot)
         return None
 
-    async def get_upcoming(self) -> List[TimeSlotsModelPydantic]:
-        time_slots = await self._time_slots_repository.find_upcoming(
-            current_time=datetime.now(timezone.utc).replace(tzinfo=None)
+    @staticmethod
+    def _meeting_provision_lease() -> Tuple[datetime, datetime]:
+        current_time = datetime.now(timezone.utc).replace(tzinfo=None)
+        return current_time, current_time - timedelta(minutes=settings.meeting_provision_lease_minutes)
+
+    async def claim_meeting_provision(self, time_slot_id: UUID) -> bool:
+        claimed_at, stale_before = self._meeting_provision_lease()
+        return await self._time_slots_repository.claim_meeting_provision(
+            time_slot_id=time_slot_id,
+            claimed_at=claimed_at,
+            stale_before=stale_before
         )
-        return time_slots
 
-    async def get_user_overlapping_slot(
-            self,
-            user_id: UUID,
-            meet_start_at_target: datetime,
-            meet_end_at_target: datetime
-    ) -> List[TimeSlotsModelPydantic]:
-        owner_overlap_slots = await self._time_slots_repository.find_overlapping_slots_for_owner(
-            user_id=user_id,
-            meet_start_at_target=meet_start_at_target,
-            meet_end_at_target=meet_end_at_target
+    async def get_missing_meeting_url_ids(self, limit: int = 100) -> List[UUID]:
+        current_time, stale_before = self._meeting_provision_lease()
+        return await self._time_slots_repository.find_missing_meeting_url_ids(
+            current_time=current_time,
+            stale_before=stale_before,
+            limit=limit
         )
-        invited_overlap_slots = await self._time_slots_repository.find_overlapping_slots_for_invited(
-            user_id=user_id,
-            meet_start_at_target=meet_start_at_target,
-            meet_end_at_target=meet_end_at_target
+
+    async def set_meeting_url(self, time_slot_id: UUID, meeting_url: str) -> Optional[TimeSlotsModelPydantic]:
+        time_slot = await self._time_slots_repository.set_meeting_url_if_confirmed(
+            time_slot_id=time_slot_id,
+            meeting_url=meeting_url
         )
-        return owner_overlap_slots + invited_overlap_slots
+
+        if time_slot:
+            return TimeSlotsModelPydantic.from_orm(time_slot)
+        return None
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List, Dict
 from uuid import UUID
 
 from backend.repository.user_repository import UserRepository
@@ -6,18 +6,29 @@ from backend.models.models import User
 from backend.schemas.user_schema import UserModelPydantic
 from backend.exceptions import UserAlreadyExistsError
 from backend.signals import user_register_signal
+from backend.loader import RequestLoader
 
 
 class UserService:
     def __init__(self, user_repository: UserRepository):
         self._user_repository = user_repository
+        self._loader = RequestLoader(name="user", batch_load=self._load_users)
+
+    async def _load_users(self, user_ids: List[UUID]) -> Dict[UUID, UserModelPydantic]:
+        users = await self._user_repository.find_by_ids(entity_ids=user_ids)
+        return {user.id: UserModelPydantic.from_orm(user) for user in users}
 
     async def find_by_max_id(self, max_id: int) -> Optional[UserModelPydantic]:
-        return await self._user_repository.find_by_max_id(max_id)
+        user = await self._user_repository.find_by_max_id(max_id)
+        if user is not None:
+            self._loader.prime(user.id, user)
+        return user
 
     async def get_by_user_id(self, user_id: UUID) -> Optional[UserModelPydantic]:
-        user = await self._user_repository.find_by_id(entity_id=user_id)
-        return UserModelPydantic.from_orm(user)
+        return await self._loader.load(user_id)
+
+    async def get_by_user_ids(self, user_ids: List[UUID]) -> List[Optional[UserModelPydantic]]:
+        return await self._loader.load_many(user_ids)
 
     async def create(
             self,
@@ -38,4 +49,7 @@ class UserService:
         )
 
         await user_register_signal.send_async(user.id)
-        return UserModelPydantic.from_orm(user)
+
+        user = UserModelPydantic.from_orm(user)
+        self._loader.prime(user.id, user)
+        return user
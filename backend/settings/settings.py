@@ -3,6 +3,7 @@ import os
 from pydantic_settings import BaseSettings
 
 from backend.enums.profile_enum import Profile
+from backend.enums.db_pool_mode_enum import DBPoolMode
 
 
 class Settings(BaseSettings):
@@ -20,12 +21,42 @@ class Settings(BaseSettings):
     sql_alchemy_connection_url: str = f"postgresql+asyncpg://{db_connection_rout}"
 
     sql_echo: bool = False  # True для отладки SQL-запросов
+    db_query_stats_enabled: bool = False  # счётчик запросов на запрос/задачу и лог медленных запросов
+    db_slow_query_ms: float = 200
+
+    # connection pool
+    db_pool_mode: DBPoolMode = DBPoolMode.QUEUE  # null - для pgbouncer в режиме transaction
+    db_pool_size: int = 50
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    db_pool_recycle_seconds: int = -1  # -1 - не пересоздавать соединения по возрасту
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100  # кэш prepared statements asyncpg на соединение
+
+    # reminders
+    reminder_tick_minutes: int = 1  # окно догоняющей проверки, если отметки ещё нет
+
+    # time slots
+    time_slots_max_range_days: int = 42  # максимум дней в запросе расписания за период
+
+    # in-memory caches
+    settings_cache_max_size: int = 10000
+    settings_cache_ttl_seconds: float = 60
+    share_token_cache_max_size: int = 10000
+    share_token_cache_ttl_seconds: float = 300
+    share_token_negative_ttl_seconds: float = 30  # для несуществующих токенов
+    busy_bitmap_cache_max_size: int = 20000  # записей (пользователь, UTC-сутки)
+    busy_bitmap_cache_ttl_seconds: float = 5  # маски не синхронизируются между воркерами
 
     # max bot
     max_api_key: str = os.getenv("MAX_API_KEY")
 
     # sber
     sber_api_key: str = os.getenv("SBER_API_KEY")
+    meeting_provision_attempts: int = 5
+    meeting_provision_backoff_seconds: float = 2  # удваивается с каждой попыткой
+    # Дольше всех попыток с таймаутами; после неё cron повторяет создание ссылки
+    meeting_provision_lease_minutes: int = 10
     gigachat_api_key: str = os.getenv("GIGACHAT_API_KEY")
 
     profile: Profile = os.getenv("PROFILE")
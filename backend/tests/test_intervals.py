@@ -0,0 +1,135 @@
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+from backend.intervals import (
+    MINUTES_PER_DAY,
+    minutes_since,
+    float_time_to_minutes,
+    minutes_to_float_time,
+    daily_slot_grid,
+    interval_mask,
+    free_grid_slots_mask
+)
+
+
+def brute_force_free_slots(grid, duration_minutes, bookings):
+    """ Прямая проверка каждого слота сетки против каждой брони. """
+    return [
+        slot_start
+        for slot_start in grid
+        if not any(
+            start < slot_start + duration_minutes and end > slot_start
+            for start, end in bookings
+        )
+    ]
+
+
+def bookings_mask(bookings, size=MINUTES_PER_DAY):
+    mask = 0
+    for start, end in bookings:
+        mask |= interval_mask(start, end, size)
+    return mask
+
+
+def random_bookings(rng, count, size=MINUTES_PER_DAY):
+    bookings = []
+    for _ in range(count):
+        start = rng.randrange(-60, size)
+        bookings.append((start, start + rng.randrange(0, 180)))
+    return bookings
+
+
+def test_float_time_round_trip():
+    for m in range(MINUTES_PER_DAY):
+        assert float_time_to_minutes(minutes_to_float_time(m)) == m
+
+    assert float_time_to_minutes(14.30) == 870
+    assert minutes_to_float_time(870) == 14.30
+
+
+def test_float_time_rejects_invalid_minutes():
+    with pytest.raises(ValueError):
+        float_time_to_minutes(10.75)
+
+
+def test_minutes_since_rounds_down():
+    origin = datetime(2025, 1, 1)
+    assert minutes_since(datetime(2025, 1, 1, 1, 30, 59), origin) == 90
+    assert minutes_since(datetime(2024, 12, 31, 23, 59, 30), origin) == -1
+
+
+def test_daily_slot_grid():
+    assert daily_slot_grid(540, 720, 60) == (540, 600, 660)
+    # Неполный последний слот в сетку не попадает
+    assert daily_slot_grid(540, 700, 60) == (540, 600)
+
+    with pytest.raises(ValueError):
+        daily_slot_grid(600, 600, 30)
+    with pytest.raises(ValueError):
+        daily_slot_grid(540, 720, 0)
+
+
+def test_interval_mask():
+    assert interval_mask(0, 3, 10) == 0b111
+    assert interval_mask(2, 4, 10) == 0b1100
+    # Обрезается до [0, size)
+    assert interval_mask(-5, 2, 10) == 0b11
+    assert interval_mask(8, 20, 10) == 0b1100000000
+    # Пустые и перевёрнутые интервалы
+    assert interval_mask(5, 5, 10) == 0
+    assert interval_mask(6, 5, 10) == 0
+    assert interval_mask(12, 15, 10) == 0
+
+
+def test_free_grid_slots_mask_edges():
+    grid = daily_slot_grid(540, 720, 60)
+
+    assert free_grid_slots_mask(grid, 60, 0) == [540, 600, 660]
+    # Бронь, заканчивающаяся ровно в начале слота, его не занимает
+    assert free_grid_slots_mask(grid, 60, bookings_mask([(480, 540)])) == [540, 600, 660]
+    assert free_grid_slots_mask(grid, 60, bookings_mask([(599, 600)])) == [600, 660]
+    assert free_grid_slots_mask(grid, 60, bookings_mask([(0, MINUTES_PER_DAY)])) == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_free_grid_slots_mask_matches_brute_force(seed):
+    rng = random.Random(seed)
+
+    duration = rng.choice([5, 15, 30, 45, 60, 90])
+    start_min = rng.randrange(0, 600)
+    end_min = rng.randrange(start_min + duration, MINUTES_PER_DAY + 1)
+    grid = daily_slot_grid(start_min, end_min, duration)
+    bookings = random_bookings(rng, rng.randrange(0, 40))
+
+    assert free_grid_slots_mask(grid, duration, bookings_mask(bookings)) == \
+        brute_force_free_slots(grid, duration, bookings)
+
+
+def test_free_grid_slots_mask_benchmark():
+    """
+    Полный день сеткой по 5 минут. Время только выводится (pytest -s),
+    а не сравнивается: на нагруженной машине замеры нестабильны.
+    """
+    rng = random.Random(0)
+    grid = daily_slot_grid(0, MINUTES_PER_DAY, 5)
+    bookings = random_bookings(rng, 100)
+    rounds = 20
+
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        expected = brute_force_free_slots(grid, 5, bookings)
+    brute_force_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        actual = free_grid_slots_mask(grid, 5, bookings_mask(bookings))
+    mask_seconds = time.perf_counter() - started_at
+
+    assert actual == expected
+    print(
+        f"\nfree_grid_slots_mask: {mask_seconds / rounds * 1000:.3f} мс, "
+        f"перебор: {brute_force_seconds / rounds * 1000:.3f} мс"
+    )